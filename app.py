@@ -43,20 +43,40 @@ def create_app():
     db.init_app(app)
     
     # Import models so they're registered with SQLAlchemy
-    from src.models import User, Plan, Subscription, Visit
+    from src.models import User, Plan, Subscription, Visit, BillingRecord, DailyPlanUsage, BillingEvent
     
     # Create tables
     with app.app_context():
         db.create_all()
+
+        # Add columns introduced after the tables were first created
+        from src.config.migrations import apply_migrations
+        apply_migrations()
         
         # Initialize default data using scripts
         from scripts.init_data import init_default_plans
         init_default_plans()
+
+        # Load caches before readiness reports ok
+        from src.services import warm_caches
+        warm_caches()
     
     # Register API blueprints
     from src.controllers.routes import register_blueprints
     register_blueprints(app)
 
+    # Per-tenant request timing
+    from src.services import init_request_metrics
+    init_request_metrics(app)
+
+    # Background writer for the billing event log
+    from src.services import event_log
+    event_log.init_app(app)
+
+    # In-flight tracking for graceful shutdown
+    from src.services import init_lifecycle
+    init_lifecycle(app)
+
     # Root route
     @app.route("/", methods=["GET"])
     def index():
@@ -76,4 +96,11 @@ app = create_app()
 
 if __name__ == '__main__':
     from src.config.settings import settings
+    from src.services import install_signal_handlers, start_renewal_scheduler
+    install_signal_handlers(app, settings.SHUTDOWN_DRAIN_SECONDS, settings.SHUTDOWN_GRACE_SECONDS)
+
+    # Optional in-process renewal scheduler - only for the server itself, not
+    # for scripts that import `app`
+    if settings.RENEWAL_INTERVAL_SECONDS > 0:
+        start_renewal_scheduler(app, settings.RENEWAL_INTERVAL_SECONDS, settings.RENEWAL_BATCH_SIZE)
     app.run(host=settings.HOST, port=settings.PORT, debug=settings.DEBUG)
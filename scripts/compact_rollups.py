@@ -0,0 +1,42 @@
+"""
+Rebuild the daily usage rollups from raw visits.
+
+Run periodically (e.g. nightly from cron) to compact recent days, or
+once with --since to backfill visits recorded before rollups existed.
+
+Usage: python scripts/compact_rollups.py [--days 2] [--since YYYY-MM-DD]
+"""
+
+import sys
+import os
+import argparse
+import datetime
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Rebuild daily usage rollups')
+    parser.add_argument('--days', type=int, default=2, help='Rebuild this many most recent days')
+    parser.add_argument('--since', help='Rebuild every day from this date (YYYY-MM-DD)')
+    args = parser.parse_args()
+
+    # Importing the module-level app runs the setup once
+    from app import app
+    from src.config.tenants import tenant_registry, tenant_context
+    from src.services import rebuild_daily_rollups, tenant_metrics
+
+    end = datetime.date.today()
+    start = (datetime.date.fromisoformat(args.since) if args.since
+             else end - datetime.timedelta(days=args.days - 1))
+
+    with app.app_context():
+        for tenant_id in tenant_registry.tenant_ids() or [None]:
+            with tenant_context(tenant_id):
+                started = time.perf_counter()
+                rows = rebuild_daily_rollups(start, end)
+                elapsed = time.perf_counter() - started
+                tenant_metrics.record_job(tenant_id, 'rollups', elapsed, rows)
+            print(f"✓ {tenant_id or 'default'}: {rows} rollup rows for {start}..{end} in {elapsed:.2f}s")
@@ -0,0 +1,99 @@
+"""
+Generate a JWT signing key and publish its public half in a JWKS file.
+
+Rotation without downtime:
+  1. Run this script with a new kid. The public key is appended to the
+     JWKS file, and the old keys stay in it.
+  2. Distribute the JWKS file to every node. A verifier re-reads it on
+     the first token with an unknown kid once the file's mtime changes.
+     The new key must be on every node before step 3.
+  3. Point issuing nodes at the new private key (JWT_PRIVATE_KEY_FILE,
+     JWT_SIGNING_KID).
+  4. After JWT_REFRESH_TTL_SECONDS, remove the old kid with --retire.
+
+Usage:
+  python scripts/generate_jwt_key.py --kid 2025-11 --alg EdDSA \\
+      --private-out instance/jwt-2025-11.pem --jwks instance/jwks.json
+  python scripts/generate_jwt_key.py --retire 2025-10 --jwks instance/jwks.json
+"""
+
+import argparse
+import json
+import os
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from jwt.algorithms import ECAlgorithm, OKPAlgorithm
+
+
+def load_jwks(path):
+    """Read a JWKS file, or return an empty key set if it does not exist."""
+    if not os.path.exists(path):
+        return {'keys': []}
+    with open(path, 'r', encoding='utf-8') as fh:
+        return json.load(fh)
+
+
+def write_jwks(path, jwks):
+    """Write the JWKS file atomically so readers never see a partial file."""
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as fh:
+        json.dump(jwks, fh, indent=2)
+    os.replace(tmp_path, path)
+
+
+def generate(kid, alg, private_out, jwks_path):
+    """Create a key pair, write the private PEM and add the public JWK."""
+    jwks = load_jwks(jwks_path)
+    if any(k.get('kid') == kid for k in jwks['keys']):
+        raise SystemExit(f'kid {kid!r} already exists in {jwks_path}')
+
+    if alg == 'EdDSA':
+        private_key = ed25519.Ed25519PrivateKey.generate()
+        public_jwk = json.loads(OKPAlgorithm.to_jwk(private_key.public_key()))
+    else:
+        private_key = ec.generate_private_key(ec.SECP256R1())
+        public_jwk = json.loads(ECAlgorithm.to_jwk(private_key.public_key()))
+
+    pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()
+    )
+    fd = os.open(private_out, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'wb') as fh:
+        fh.write(pem)
+
+    public_jwk.update({'kid': kid, 'alg': alg, 'use': 'sig'})
+    jwks['keys'].append(public_jwk)
+    write_jwks(jwks_path, jwks)
+
+    print(f"✓ Wrote private key to {private_out}")
+    print(f"✓ Published kid {kid!r} in {jwks_path} ({len(jwks['keys'])} keys)")
+
+
+def retire(kid, jwks_path):
+    """Remove a key from the JWKS file."""
+    jwks = load_jwks(jwks_path)
+    remaining = [k for k in jwks['keys'] if k.get('kid') != kid]
+    if len(remaining) == len(jwks['keys']):
+        raise SystemExit(f'kid {kid!r} not found in {jwks_path}')
+    write_jwks(jwks_path, {'keys': remaining})
+    print(f"✓ Retired kid {kid!r} ({len(remaining)} keys left)")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Manage JWT signing keys')
+    parser.add_argument('--jwks', required=True, help='JWKS file with public keys')
+    parser.add_argument('--kid', help='Key id of the new key')
+    parser.add_argument('--alg', choices=['EdDSA', 'ES256'], default='EdDSA')
+    parser.add_argument('--private-out', help='Where to write the new private key (PEM)')
+    parser.add_argument('--retire', metavar='KID', help='Remove this key id from the JWKS file')
+    args = parser.parse_args()
+
+    if args.retire:
+        retire(args.retire, args.jwks)
+    elif args.kid and args.private_out:
+        generate(args.kid, args.alg, args.private_out, args.jwks)
+    else:
+        parser.error('either --kid and --private-out, or --retire, are required')
@@ -11,9 +11,15 @@ from src.config.database import db
 from src.models import Plan
 
 
-def init_default_plans():
-    """Initialize default subscription plans if they don't exist."""
-    if Plan.query.count() == 0:
+def init_default_plans(session=None):
+    """
+    Initialize default subscription plans if they don't exist.
+
+    Args:
+        session: Session to use (default: db.session)
+    """
+    session = session or db.session
+    if session.query(Plan).count() == 0:
         plans = [
             {
                 'name': 'Lite Care Pack',
@@ -53,12 +59,12 @@ def init_default_plans():
                 extra_visit_price=p['extra_visit_price'],
                 services_json=json.dumps(p['services'])
             )
-            db.session.add(plan)
+            session.add(plan)
 
-        db.session.commit()
+        session.commit()
         print(f"✓ Initialized {len(plans)} default subscription plans")
     else:
-        print(f"✓ Plans already exist ({Plan.query.count()} plans found)")
+        print(f"✓ Plans already exist ({session.query(Plan).count()} plans found)")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,23 @@
+"""Process due subscription renewals. Run periodically, e.g. from cron."""
+
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+if __name__ == '__main__':
+    # Importing the module-level app runs the setup once
+    from app import app
+    from src.config.settings import settings
+    from src.services import process_all_tenant_renewals
+
+    with app.app_context():
+        started = time.perf_counter()
+        results = process_all_tenant_renewals(batch_size=settings.RENEWAL_BATCH_SIZE)
+        elapsed = time.perf_counter() - started
+        for tenant_id, renewed in results.items():
+            print(f"  {tenant_id or 'default'}: {renewed} renewed")
+        print(f"✓ Renewed {sum(results.values())} subscriptions in {elapsed:.2f}s")
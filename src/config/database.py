@@ -1,5 +1,18 @@
 """Database instance."""
 
+from flask import g, has_app_context
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
 
-db = SQLAlchemy()
+
+class TenantSession(Session):
+    """Session that routes queries to the current tenant's engine, if any."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_app_context() and g.get('tenant_id'):
+            from src.config.tenants import tenant_registry
+            return tenant_registry.get_engine(g.tenant_id)
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+db = SQLAlchemy(session_options={'class_': TenantSession})
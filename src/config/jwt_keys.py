@@ -0,0 +1,149 @@
+"""
+JWT signing and verification keys.
+
+With the default HS256, every node signs and verifies with the shared
+`JWT_SECRET`. With EdDSA or ES256, only nodes that issue tokens need
+the private key (`JWT_PRIVATE_KEY_FILE`); every other node verifies
+with the public keys in a JWKS file (`JWT_JWKS_FILE`), chosen by the
+token's `kid` header.
+
+Keys are parsed once and cached. When a token names a `kid` that is not
+cached yet, the JWKS file is checked and re-read as soon as its mtime
+changes, so a newly published key is picked up without a restart. If
+the mtime is unchanged the file is re-read at most once per
+`reload_interval` seconds, which covers rewrites within the same mtime
+tick without letting unknown kids force a parse on every request.
+Malformed keys are skipped, and a file that cannot be parsed (e.g. one
+caught mid-write) leaves the previously loaded keys in place.
+"""
+
+import json
+import os
+import threading
+import time
+
+import jwt
+from jwt.algorithms import ECAlgorithm, OKPAlgorithm
+
+from src.config.settings import settings
+
+ASYMMETRIC_ALGORITHMS = ('EdDSA', 'ES256')
+
+
+class KeyRing:
+    """Cached signing key and `kid`-indexed verification keys."""
+
+    def __init__(self, algorithm, secret=None, private_key_file=None, signing_kid=None,
+                 jwks_file=None, reload_interval=30):
+        self.algorithm = algorithm
+        self._secret = secret
+        self._private_key_file = private_key_file
+        self._signing_kid = signing_kid
+        self._jwks_file = jwks_file
+        self._reload_interval = reload_interval
+        self._private_key = None
+        self._public_keys = {}
+        self._public_jwks = []
+        self._jwks_mtime = None
+        self._last_read = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def asymmetric(self):
+        """True when tokens are signed with a private key."""
+        return self.algorithm in ASYMMETRIC_ALGORITHMS
+
+    def signing_key(self):
+        """
+        Return (key, kid) used to sign new tokens.
+
+        Raises:
+            RuntimeError: If this node has no private key configured
+        """
+        if not self.asymmetric:
+            return self._secret, None
+
+        if self._private_key is None:
+            if not self._private_key_file:
+                raise RuntimeError('JWT_PRIVATE_KEY_FILE is required to issue tokens')
+            with open(self._private_key_file, 'rb') as fh:
+                pem = fh.read()
+            algorithm = OKPAlgorithm() if self.algorithm == 'EdDSA' else ECAlgorithm(ECAlgorithm.SHA256)
+            self._private_key = algorithm.prepare_key(pem)
+        return self._private_key, self._signing_kid
+
+    def verification_key(self, kid):
+        """Return the key that verifies tokens with this `kid`, or None if unknown."""
+        if not self.asymmetric:
+            return self._secret
+
+        key = self._public_keys.get(kid)
+        if key is None and self._maybe_reload():
+            key = self._public_keys.get(kid)
+        return key
+
+    def public_jwks(self):
+        """Return the public key set as a JWKS document."""
+        if not self.asymmetric:
+            return {'keys': []}
+        if self._jwks_mtime is None:
+            self._maybe_reload(force=True)
+        return {'keys': list(self._public_jwks)}
+
+    def _maybe_reload(self, force=False):
+        """
+        Re-read the JWKS file if its mtime changed, or if it is unchanged
+        but was last read over `reload_interval` seconds ago. Returns True
+        if keys were reloaded.
+        """
+        if not self._jwks_file:
+            return False
+
+        with self._lock:
+            try:
+                mtime = os.path.getmtime(self._jwks_file)
+            except OSError:
+                return False
+            now = time.monotonic()
+            if not force and mtime == self._jwks_mtime and now - self._last_read < self._reload_interval:
+                return False
+
+            # Whatever happens below, don't re-read this version until it changes
+            self._jwks_mtime = mtime
+            self._last_read = now
+
+            try:
+                with open(self._jwks_file, 'r', encoding='utf-8') as fh:
+                    data = json.load(fh)
+                entries = data['keys']
+                if not isinstance(entries, list):
+                    raise ValueError('"keys" is not a list')
+            except (OSError, ValueError, KeyError, TypeError) as exc:
+                print(f"⚠️  Could not read JWKS file {self._jwks_file}, keeping previous keys: {exc}")
+                return False
+
+            keys = {}
+            published = []
+            for jwk in entries:
+                if not isinstance(jwk, dict):
+                    continue
+                if jwk.get('alg', self.algorithm) == self.algorithm and 'kid' in jwk:
+                    try:
+                        keys[jwk['kid']] = jwt.PyJWK(jwk, algorithm=self.algorithm).key
+                    except (jwt.PyJWTError, ValueError, TypeError) as exc:
+                        print(f"⚠️  Skipping invalid JWK {jwk.get('kid')!r}: {exc}")
+                        continue
+                published.append({k: v for k, v in jwk.items() if k != 'd'})
+
+            self._public_keys = keys
+            self._public_jwks = published
+            return True
+
+
+key_ring = KeyRing(
+    settings.JWT_ALGORITHM,
+    secret=settings.JWT_SECRET,
+    private_key_file=settings.JWT_PRIVATE_KEY_FILE,
+    signing_kid=settings.JWT_SIGNING_KID,
+    jwks_file=settings.JWT_JWKS_FILE
+)
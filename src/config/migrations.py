@@ -0,0 +1,70 @@
+"""
+Lightweight schema migrations.
+
+`db.create_all()` only creates missing tables, so columns added to
+existing models are applied here with ALTER TABLE statements, compiled
+for the target database's dialect (e.g. BOOLEAN defaults and DATETIME
+vs TIMESTAMP differ between SQLite and PostgreSQL). Each migration is
+skipped when its column already exists, which makes running them on
+every startup safe.
+"""
+
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, false, inspect, text
+from sqlalchemy.schema import CreateColumn
+
+from src.config.database import db
+
+
+# (table, column) - added in order when the column is missing. Columns
+# added as NOT NULL need a server default to fill existing rows.
+COLUMN_MIGRATIONS = [
+    ('subscription', Column('period_days', Integer, nullable=False, server_default=text('30'))),
+    # Subscriptions created before renewals existed were one-shot, so they
+    # must not start renewing; new rows get the model default (True)
+    ('subscription', Column('auto_renew', Boolean, nullable=False, server_default=false())),
+    ('subscription', Column('cancelled_at', DateTime)),
+    ('visit', Column('plan_id', Integer, ForeignKey('plan.id'))),
+]
+
+# Indexes on pre-existing tables - idempotent by construction
+INDEX_MIGRATIONS = [
+    'CREATE INDEX IF NOT EXISTS ix_subscription_end_date ON subscription (end_date)',
+]
+
+
+def add_column_ddl(table, column, dialect):
+    """Return the ALTER TABLE ... ADD COLUMN statement for `column` in `dialect`."""
+    preparer = dialect.identifier_preparer
+    ddl = f'ALTER TABLE {preparer.quote(table)} ADD COLUMN {CreateColumn(column).compile(dialect=dialect)}'
+    for fk in column.foreign_keys:
+        ref_table, ref_column = fk.target_fullname.split('.')
+        ddl += f' REFERENCES {preparer.quote(ref_table)} ({preparer.quote(ref_column)})'
+    return ddl
+
+
+def pending_migrations(engine=None):
+    """Return the (table, column) pairs whose migration has not run yet."""
+    inspector = inspect(engine or db.engine)
+    pending = []
+    for table, column in COLUMN_MIGRATIONS:
+        existing = {c['name'] for c in inspector.get_columns(table)}
+        if column.name not in existing:
+            pending.append((table, column.name))
+    return pending
+
+
+def apply_migrations(engine=None):
+    """
+    Apply all pending migrations to `engine` (default: the app engine).
+    Must be called inside an app context.
+    """
+    engine = engine or db.engine
+    pending = set(pending_migrations(engine))
+    with engine.begin() as conn:
+        for table, column in COLUMN_MIGRATIONS:
+            if (table, column.name) in pending:
+                conn.execute(text(add_column_ddl(table, column, engine.dialect)))
+        for ddl in INDEX_MIGRATIONS:
+            conn.execute(text(ddl))
+    if pending:
+        print(f"✓ Applied {len(pending)} schema migrations")
@@ -7,6 +7,9 @@ from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 
+# JWT algorithms with a key handling path in src/config/jwt_keys.py
+JWT_ALGORITHMS = ('HS256', 'EdDSA', 'ES256')
+
 
 class Settings:
     """Application settings loaded from environment variables."""
@@ -25,20 +28,63 @@ class Settings:
         self.SQLALCHEMY_TRACK_MODIFICATIONS = False
         print(f"✓ Database URI: {self.SQLALCHEMY_DATABASE_URI}")
 
-        # JWT Secret - MUST be set in production
+        # JWT signing - HS256 with a shared secret, or EdDSA/ES256 with a key set
+        self.JWT_ALGORITHM = os.getenv('JWT_ALGORITHM', 'HS256')
+        if self.JWT_ALGORITHM not in JWT_ALGORITHMS:
+            raise ValueError(
+                f"JWT_ALGORITHM must be one of {', '.join(JWT_ALGORITHMS)}, got {self.JWT_ALGORITHM!r}"
+            )
+        self.JWT_PRIVATE_KEY_FILE = os.getenv('JWT_PRIVATE_KEY_FILE')  # only on nodes that issue tokens
+        self.JWT_SIGNING_KID = os.getenv('JWT_SIGNING_KID')
+        self.JWT_JWKS_FILE = os.getenv('JWT_JWKS_FILE')  # public keys, on every node
+        self.JWT_ACCESS_TTL_SECONDS = int(os.getenv('JWT_ACCESS_TTL_SECONDS', 900))
+        self.JWT_REFRESH_TTL_SECONDS = int(os.getenv('JWT_REFRESH_TTL_SECONDS', 7 * 24 * 3600))
+
+        # JWT Secret - MUST be set in production when using HS256
         self.JWT_SECRET = os.getenv('JWT_SECRET')
         if not self.JWT_SECRET:
             # For development only - NEVER use in production
             self.JWT_SECRET = 'dev-secret-CHANGE-IN-PRODUCTION'
-            if self.DEBUG:
+            if self.DEBUG and self.JWT_ALGORITHM == 'HS256':
                 print("⚠️  WARNING: Using default JWT_SECRET. Set JWT_SECRET in .env file for production!")
 
+        # Multi-tenancy - comma-separated tenant ids; empty keeps a single shared database
+        self.TENANTS = [t.strip() for t in os.getenv('TENANTS', '').split(',') if t.strip()]
+        # {tenant} is replaced by the tenant id (a database file, or a schema via the URI options)
+        self.TENANT_DATABASE_URI = os.getenv(
+            'TENANT_DATABASE_URI', f'sqlite:///{project_root / "instance" / "tenants"}/{{tenant}}.db'
+        )
+        self.TENANT_POOL_SIZE = int(os.getenv('TENANT_POOL_SIZE', 5))
+        self.TENANT_MAX_OVERFLOW = int(os.getenv('TENANT_MAX_OVERFLOW', 5))
+        if self.TENANTS:
+            print(f"✓ Tenants: {', '.join(self.TENANTS)}")
+
+        # Operator key for /api/admin endpoints - admin API is disabled when unset
+        self.ADMIN_API_KEY = os.getenv('ADMIN_API_KEY')
+
+        # Graceful shutdown - keep serving while the load balancer deregisters,
+        # then wait for in-flight requests before exiting
+        self.SHUTDOWN_DRAIN_SECONDS = float(os.getenv('SHUTDOWN_DRAIN_SECONDS', 5))
+        self.SHUTDOWN_GRACE_SECONDS = float(os.getenv('SHUTDOWN_GRACE_SECONDS', 20))
+
+        # Billing event log - buffered appender flushed in batches off the request path
+        self.EVENT_BATCH_SIZE = int(os.getenv('EVENT_BATCH_SIZE', 500))
+        self.EVENT_FLUSH_INTERVAL_SECONDS = float(os.getenv('EVENT_FLUSH_INTERVAL_SECONDS', 0.5))
+        self.EVENT_BUFFER_MAX = int(os.getenv('EVENT_BUFFER_MAX', 100000))
+
+        # Subscription renewals
+        self.RENEWAL_BATCH_SIZE = int(os.getenv('RENEWAL_BATCH_SIZE', 5000))
+        # 0 disables the in-process scheduler (use scripts/process_renewals.py from cron instead)
+        self.RENEWAL_INTERVAL_SECONDS = int(os.getenv('RENEWAL_INTERVAL_SECONDS', 0))
+
     def ensure_data_dir(self):
         """Ensure instance directory exists for database."""
         import os
         project_root = Path(__file__).parent.parent.parent
         instance_dir = project_root / 'instance'
         instance_dir.mkdir(exist_ok=True)
+        if self.TENANTS:
+            (instance_dir / 'tenants').mkdir(exist_ok=True)
         print(f"✓ Instance directory: {instance_dir}")
 
 
@@ -0,0 +1,144 @@
+"""
+Tenant-scoped connection routing.
+
+Each tenant (clinic network) gets its own database - a separate SQLite
+file by default - with its own connection pool and plan catalog cache.
+The current tenant is stored on `flask.g.tenant_id`; `TenantSession`
+routes every query made through `db.session` to that tenant's engine.
+With no tenants configured, everything uses the app's default database.
+"""
+
+import re
+import threading
+from contextlib import contextmanager
+
+from flask import g
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from src.config.database import db
+from src.config.settings import settings
+
+TENANT_ID_PATTERN = re.compile(r'^[a-z0-9][a-z0-9_-]{0,62}$')
+
+
+class UnknownTenantError(LookupError):
+    """Raised when a tenant id is not configured."""
+
+
+class TenantRegistry:
+    """Lazily creates, bootstraps and caches one engine per tenant."""
+
+    def __init__(self, tenant_ids, uri_template, pool_size=5, max_overflow=5):
+        self._tenant_ids = list(tenant_ids)
+        self._uri_template = uri_template
+        self._pool_size = pool_size
+        self._max_overflow = max_overflow
+        self._engines = {}
+        self._plan_catalogs = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        """True when multi-tenancy is configured."""
+        return bool(self._tenant_ids)
+
+    def tenant_ids(self):
+        """Return the configured tenant ids."""
+        return list(self._tenant_ids)
+
+    def is_known(self, tenant_id):
+        """Check whether a tenant id is configured."""
+        return tenant_id in self._tenant_ids
+
+    def get_engine(self, tenant_id):
+        """Return the tenant's engine, creating its database on first use."""
+        engine = self._engines.get(tenant_id)
+        if engine is not None:
+            return engine
+
+        if not self.is_known(tenant_id) or not TENANT_ID_PATTERN.match(tenant_id):
+            raise UnknownTenantError(tenant_id)
+
+        with self._lock:
+            engine = self._engines.get(tenant_id)
+            if engine is None:
+                engine = self._create_engine(tenant_id)
+                self._bootstrap(engine)
+                self._engines[tenant_id] = engine
+        return engine
+
+    def engines(self):
+        """Return the engines created so far, keyed by tenant id."""
+        return dict(self._engines)
+
+    def get_plan_catalog(self, tenant_id, loader):
+        """
+        Return the cached plan catalog for a tenant (None = default database).
+
+        `loader` is called once per tenant to build the catalog.
+        """
+        catalog = self._plan_catalogs.get(tenant_id)
+        if catalog is None:
+            catalog = loader()
+            self._plan_catalogs[tenant_id] = catalog
+        return catalog
+
+    def has_plan_catalog(self, tenant_id):
+        """Check whether a tenant's plan catalog is cached."""
+        return tenant_id in self._plan_catalogs
+
+    def invalidate_plan_catalog(self, tenant_id=None):
+        """Drop a tenant's cached plan catalog."""
+        self._plan_catalogs.pop(tenant_id, None)
+
+    def _create_engine(self, tenant_id):
+        uri = self._uri_template.format(tenant=tenant_id)
+        return create_engine(
+            uri,
+            pool_size=self._pool_size,
+            max_overflow=self._max_overflow,
+            pool_pre_ping=True
+        )
+
+    def _bootstrap(self, engine):
+        """Create tables, run migrations and seed default plans for a new tenant."""
+        from src.config.migrations import apply_migrations
+        from scripts.init_data import init_default_plans
+
+        db.metadata.create_all(engine)
+        apply_migrations(engine)
+        with Session(bind=engine) as session:
+            init_default_plans(session)
+
+
+tenant_registry = TenantRegistry(
+    settings.TENANTS,
+    settings.TENANT_DATABASE_URI,
+    pool_size=settings.TENANT_POOL_SIZE,
+    max_overflow=settings.TENANT_MAX_OVERFLOW
+)
+
+
+def current_tenant_id():
+    """Return the tenant of the current app context, or None."""
+    return g.get('tenant_id')
+
+
+@contextmanager
+def tenant_context(tenant_id):
+    """
+    Route `db.session` to `tenant_id` for the duration of the block.
+
+    Used by batch jobs that walk every tenant. The session is removed on
+    entry and exit so no connection leaks between tenants; commit any
+    pending work before entering.
+    """
+    previous = g.get('tenant_id')
+    db.session.remove()
+    g.tenant_id = tenant_id
+    try:
+        yield
+    finally:
+        db.session.remove()
+        g.tenant_id = previous
@@ -1,6 +1,6 @@
 """Controllers package."""
 
-from .auth import auth_bp, auth_required
+from .auth import auth_bp, auth_required, admin_required
 from .plans import plans_bp
 
-__all__ = ['auth_bp', 'plans_bp', 'auth_required']
+__all__ = ['auth_bp', 'plans_bp', 'auth_required', 'admin_required']
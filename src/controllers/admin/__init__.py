@@ -0,0 +1,5 @@
+"""Admin controller package."""
+
+from .routes import admin_bp
+
+__all__ = ['admin_bp']
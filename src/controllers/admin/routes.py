@@ -0,0 +1,163 @@
+"""Operator-only admin routes."""
+
+from flask import Blueprint, request, jsonify
+import datetime
+
+from src.config.database import db
+from src.config.tenants import tenant_registry
+from src.controllers.auth import admin_required
+from src.services import (
+    tenant_metrics,
+    visits_per_plan_per_day,
+    extra_revenue_by_month,
+    included_visit_utilization,
+    load_events,
+    replay_events
+)
+
+admin_bp = Blueprint('admin', __name__)
+
+DEFAULT_RANGE_DAYS = 30
+MAX_RANGE_DAYS = 3660
+MAX_EVENTS_PAGE = 5000
+
+
+def _parse_date_range():
+    """
+    Read ?start=YYYY-MM-DD&end=YYYY-MM-DD (default: the last 30 days).
+
+    Returns:
+        (start, end, error_response) - error_response is None when valid
+    """
+    today = datetime.date.today()
+    try:
+        end = datetime.date.fromisoformat(request.args['end']) if 'end' in request.args else today
+        start = (datetime.date.fromisoformat(request.args['start']) if 'start' in request.args
+                 else end - datetime.timedelta(days=DEFAULT_RANGE_DAYS - 1))
+    except ValueError:
+        return None, None, (jsonify({'message': 'Dates must be YYYY-MM-DD'}), 400)
+
+    if start > end:
+        return None, None, (jsonify({'message': 'start must not be after end'}), 400)
+
+    if (end - start).days >= MAX_RANGE_DAYS:
+        return None, None, (jsonify({'message': f'Range is limited to {MAX_RANGE_DAYS} days'}), 400)
+
+    return start, end, None
+
+
+@admin_bp.route('/metrics/tenants', methods=['GET'])
+@admin_required(tenant_scoped=False)
+def get_tenant_metrics():
+    """
+    Get request load, batch job time and pool usage per tenant,
+    to make noisy neighbours visible.
+    """
+    engines = tenant_registry.engines()
+    if not tenant_registry.enabled:
+        engines = {None: db.engine}
+
+    return jsonify({
+        'tenants': tenant_metrics.snapshot(engines)
+    })
+
+
+@admin_bp.route('/analytics/visits', methods=['GET'])
+@admin_required
+def get_visits_per_plan():
+    """Get visits per plan per day."""
+    start, end, error = _parse_date_range()
+    if error:
+        return error
+
+    return jsonify({
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'days': visits_per_plan_per_day(start, end)
+    })
+
+
+@admin_bp.route('/analytics/revenue', methods=['GET'])
+@admin_required
+def get_extra_revenue():
+    """Get extra-visit revenue by month."""
+    start, end, error = _parse_date_range()
+    if error:
+        return error
+
+    months = extra_revenue_by_month(start, end)
+    return jsonify({
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'months': months,
+        'total_extra_charges': round(sum(m['extra_charges'] for m in months), 2)
+    })
+
+
+@admin_bp.route('/analytics/utilization', methods=['GET'])
+@admin_required
+def get_included_visit_utilization():
+    """Get utilization of included visits per plan per month."""
+    start, end, error = _parse_date_range()
+    if error:
+        return error
+
+    return jsonify({
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'plans': included_visit_utilization(start, end)
+    })
+
+
+@admin_bp.route('/events', methods=['GET'])
+@admin_required
+def get_events():
+    """
+    Read billing events for a date range, optionally for one user.
+    Paginate with ?after_id=<next_after_id>.
+    """
+    start, end, error = _parse_date_range()
+    if error:
+        return error
+
+    user_id = request.args.get('user_id', type=int)
+    after_id = request.args.get('after_id', 0, type=int)
+    limit = max(1, min(request.args.get('limit', 500, type=int), MAX_EVENTS_PAGE))
+
+    events = load_events(
+        user_id=user_id,
+        start=datetime.datetime.combine(start, datetime.time.min),
+        end=datetime.datetime.combine(end + datetime.timedelta(days=1), datetime.time.min),
+        after_id=after_id,
+        limit=limit
+    )
+
+    return jsonify({
+        'events': [{
+            'id': ev.id,
+            'event_type': ev.event_type,
+            'user_id': ev.user_id,
+            'subscription_id': ev.subscription_id,
+            'occurred_at': ev.occurred_at.isoformat(),
+            'payload': ev.payload()
+        } for ev in events],
+        'next_after_id': events[-1].id if len(events) == limit else None
+    })
+
+
+@admin_bp.route('/events/replay', methods=['GET'])
+@admin_required
+def replay_user_events():
+    """Rebuild a user's usage counters and ledgers from their full event history."""
+    user_id = request.args.get('user_id', type=int)
+    if user_id is None:
+        return jsonify({'message': 'user_id is required'}), 400
+
+    state = replay_events(load_events(user_id=user_id))
+
+    return jsonify({
+        'user_id': user_id,
+        'subscriptions': [
+            dict(subscription_id=sub_id, **sub) for sub_id, sub in sorted(state.items(), key=lambda i: i[0] or 0)
+        ]
+    })
@@ -1,5 +1,5 @@
 """Authentication controller package."""
 
-from .routes import auth_bp, auth_required
+from .routes import auth_bp, auth_required, admin_required
 
-__all__ = ['auth_bp', 'auth_required']
+__all__ = ['auth_bp', 'auth_required', 'admin_required']
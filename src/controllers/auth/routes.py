@@ -1,36 +1,97 @@
 """Authentication routes."""
 
-from flask import Blueprint, current_app, request, jsonify, g, make_response
+from flask import Blueprint, request, jsonify, g, make_response
 from functools import wraps
 import datetime
+import hmac
 import jwt
 import bcrypt
 
 from src.models import User
 from src.config.database import db
+from src.config.settings import settings
+from src.config.tenants import tenant_registry
+from src.config.jwt_keys import key_ring
 
 auth_bp = Blueprint('auth', __name__)
 
 
-def encode_jwt(user_id):
-    """Encode user ID into JWT token."""
+def encode_jwt(user_id, tenant_id=None, token_type='access'):
+    """
+    Encode user ID (and tenant, when multi-tenant) into a JWT token.
+
+    Access tokens are short-lived; refresh tokens are only accepted
+    by the /refresh endpoint.
+    """
+    ttl = settings.JWT_ACCESS_TTL_SECONDS if token_type == 'access' else settings.JWT_REFRESH_TTL_SECONDS
     payload = {
         'user_id': user_id,
-        'exp': datetime.datetime.utcnow() + datetime.timedelta(hours=6)
+        'type': token_type,
+        'exp': datetime.datetime.utcnow() + datetime.timedelta(seconds=ttl)
     }
-    token = jwt.encode(payload, current_app.config['JWT_SECRET'], algorithm='HS256')
+    if tenant_id:
+        payload['tenant'] = tenant_id
+
+    key, kid = key_ring.signing_key()
+    headers = {'kid': kid} if kid else None
+    token = jwt.encode(payload, key, algorithm=key_ring.algorithm, headers=headers)
     if isinstance(token, bytes):
         token = token.decode('utf-8')
     return token
 
 
-def decode_jwt(token):
-    """Decode JWT token and return payload."""
+def decode_jwt(token, token_type='access'):
+    """Decode and verify a JWT token. Returns the payload, or None if invalid."""
     try:
-        return jwt.decode(token, current_app.config['JWT_SECRET'], algorithms=['HS256'])
-    except Exception:
+        kid = jwt.get_unverified_header(token).get('kid')
+        key = key_ring.verification_key(kid)
+        if key is None:
+            return None
+        payload = jwt.decode(token, key, algorithms=[key_ring.algorithm])
+    except jwt.InvalidTokenError:
+        return None
+
+    # Tokens issued before refresh tokens existed carry no type and are access tokens
+    if payload.get('type', 'access') != token_type:
+        return None
+    return payload
+
+
+def set_auth_cookies(resp, user_id, tenant_id=None):
+    """Issue a fresh access/refresh token pair as HTTP-only cookies."""
+    # Set secure=True in production with HTTPS
+    resp.set_cookie('jwt', encode_jwt(user_id, tenant_id), httponly=True, samesite='Strict',
+                    max_age=settings.JWT_ACCESS_TTL_SECONDS)
+    resp.set_cookie('refresh_token', encode_jwt(user_id, tenant_id, token_type='refresh'),
+                    httponly=True, samesite='Strict', path='/api/auth',
+                    max_age=settings.JWT_REFRESH_TTL_SECONDS)
+    return resp
+
+
+def resolve_request_tenant():
+    """
+    Resolve the tenant for an unauthenticated request (signup/login)
+    from the X-Tenant-ID header or the `tenant` field of the JSON body,
+    and route the session to it.
+
+    Returns:
+        An error response tuple, or None on success
+    """
+    if not tenant_registry.enabled:
         return None
 
+    data = request.get_json(silent=True) or {}
+    tenant_id = request.headers.get('X-Tenant-ID') or data.get('tenant')
+
+    if not tenant_id:
+        return jsonify({'message': 'Tenant is required'}), 400
+
+    if not tenant_registry.is_known(tenant_id):
+        return jsonify({'message': 'Unknown tenant'}), 404
+
+    g.tenant_id = tenant_id
+    return None
+
 
 def auth_required(f):
     """Decorator to require authentication for routes."""
@@ -42,11 +103,46 @@ def auth_required(f):
         payload = decode_jwt(token) if token else None
         if not payload or not payload.get('user_id'):
             return jsonify({'message': 'Token invalid or missing'}), 401
+        if tenant_registry.enabled:
+            tenant_id = payload.get('tenant')
+            if not tenant_id or not tenant_registry.is_known(tenant_id):
+                return jsonify({'message': 'Token invalid or missing'}), 401
+            g.tenant_id = tenant_id
         g.user_id = payload['user_id']
         return f(*args, **kwargs)
     return wrapper
 
 
+def admin_required(f=None, *, tenant_scoped=True):
+    """
+    Decorator for operator endpoints, authenticated by the X-Admin-Key header.
+
+    The X-Tenant-ID header scopes the request to one tenant. When tenants
+    are configured it is required, so tenant data is never read from the
+    default database by accident. Endpoints that span all tenants pass
+    `tenant_scoped=False` to make the header optional.
+    """
+    if f is None:
+        return lambda func: admin_required(func, tenant_scoped=tenant_scoped)
+
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        if not settings.ADMIN_API_KEY:
+            return jsonify({'message': 'Admin API is disabled'}), 403
+        key = request.headers.get('X-Admin-Key', '')
+        if not hmac.compare_digest(key.encode('utf-8'), settings.ADMIN_API_KEY.encode('utf-8')):
+            return jsonify({'message': 'Admin key invalid or missing'}), 401
+        tenant_id = request.headers.get('X-Tenant-ID')
+        if tenant_id:
+            if not tenant_registry.is_known(tenant_id):
+                return jsonify({'message': 'Unknown tenant'}), 404
+            g.tenant_id = tenant_id
+        elif tenant_scoped and tenant_registry.enabled:
+            return jsonify({'message': 'X-Tenant-ID header is required'}), 400
+        return f(*args, **kwargs)
+    return wrapper
+
+
 @auth_bp.route('/signup', methods=['POST'])
 def signup():
     """Register a new user."""
@@ -57,6 +153,10 @@ def signup():
     if not username or not password:
         return jsonify({'message': 'Username and password required'}), 400
 
+    error = resolve_request_tenant()
+    if error:
+        return error
+
     if User.query.filter_by(username=username).first():
         return jsonify({'message': 'User already exists'}), 400
 
@@ -79,17 +179,54 @@ def login():
     if not username or not password:
         return jsonify({'message': 'Username and password required'}), 400
 
+    error = resolve_request_tenant()
+    if error:
+        return error
+
     user = User.query.filter_by(username=username).first()
 
     if not user or not bcrypt.checkpw(password.encode('utf-8'), user.password):
         return jsonify({'message': 'Invalid credentials'}), 401
 
-    token = encode_jwt(user.id)
-    resp = make_response(jsonify({'message': 'Login successful', 'username': username}))
+    resp = make_response(jsonify({
+        'message': 'Login successful',
+        'username': username,
+        'expires_in': settings.JWT_ACCESS_TTL_SECONDS
+    }))
+    return set_auth_cookies(resp, user.id, g.get('tenant_id'))
+
+
+@auth_bp.route('/refresh', methods=['POST'])
+def refresh():
+    """Exchange a refresh token for a new access/refresh token pair."""
+    data = request.get_json(silent=True) or {}
+    token = request.cookies.get('refresh_token') or data.get('refresh_token')
+    payload = decode_jwt(token, token_type='refresh') if token else None
+    if not payload or not payload.get('user_id'):
+        return jsonify({'message': 'Refresh token invalid or missing'}), 401
+
+    tenant_id = payload.get('tenant')
+    if tenant_registry.enabled:
+        if not tenant_id or not tenant_registry.is_known(tenant_id):
+            return jsonify({'message': 'Refresh token invalid or missing'}), 401
+        g.tenant_id = tenant_id
+
+    # Refresh is the only point where the user is re-checked against the database
+    user = User.query.get(payload['user_id'])
+    if not user:
+        return jsonify({'message': 'User not found'}), 401
 
-    # Set secure=True in production with HTTPS
-    resp.set_cookie('jwt', token, httponly=True, samesite='Strict')
-    return resp
+    resp = make_response(jsonify({
+        'message': 'Token refreshed',
+        'expires_in': settings.JWT_ACCESS_TTL_SECONDS
+    }))
+    return set_auth_cookies(resp, user.id, tenant_id)
+
+
+@auth_bp.route('/jwks', methods=['GET'])
+def get_jwks():
+    """Publish the public verification keys (empty for HS256)."""
+    return jsonify(key_ring.public_jwks())
 
 
 @auth_bp.route('/logout', methods=['POST'])
@@ -97,6 +234,7 @@ def logout():
     """Logout user by clearing JWT cookie."""
     resp = make_response(jsonify({'message': 'Logged out successfully'}))
     resp.set_cookie('jwt', '', expires=0, httponly=True, samesite='Strict')
+    resp.set_cookie('refresh_token', '', expires=0, httponly=True, samesite='Strict', path='/api/auth')
     return resp
 
 
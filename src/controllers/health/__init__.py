@@ -0,0 +1,5 @@
+"""Health controller package."""
+
+from .routes import health_bp
+
+__all__ = ['health_bp']
@@ -0,0 +1,73 @@
+"""Liveness and readiness probes."""
+
+from flask import Blueprint, jsonify
+from sqlalchemy import text
+
+from src.config.database import db
+from src.config.jwt_keys import key_ring
+from src.config.migrations import pending_migrations
+from src.config.tenants import tenant_registry
+from src.services import lifecycle
+
+health_bp = Blueprint('health', __name__)
+
+
+def _check_database(engine):
+    """Run a trivial query through the pool and report pending migrations."""
+    try:
+        with engine.connect() as conn:
+            conn.execute(text('SELECT 1'))
+        pending = pending_migrations(engine)
+    except Exception as exc:
+        return {'ok': False, 'error': str(exc)}
+
+    result = {
+        'ok': not pending,
+        'pending_migrations': [f'{table}.{column}' for table, column in pending]
+    }
+    if hasattr(engine.pool, 'checkedout'):
+        result['pool_checked_out'] = engine.pool.checkedout()
+    return result
+
+
+@health_bp.route('/healthz', methods=['GET'])
+def healthz():
+    """Liveness: the process is up and serving requests."""
+    return jsonify({'status': 'ok'})
+
+
+@health_bp.route('/readyz', methods=['GET'])
+def readyz():
+    """
+    Readiness: the database pool answers, no migrations are pending and
+    caches are warm. Fails as soon as the worker starts shutting down.
+    """
+    checks = {}
+
+    if tenant_registry.enabled:
+        for tenant_id in tenant_registry.tenant_ids():
+            check = _check_database(tenant_registry.get_engine(tenant_id))
+            check['plan_catalog_warm'] = tenant_registry.has_plan_catalog(tenant_id)
+            check['ok'] = check['ok'] and check['plan_catalog_warm']
+            checks[f'tenant:{tenant_id}'] = check
+    else:
+        check = _check_database(db.engine)
+        check['plan_catalog_warm'] = tenant_registry.has_plan_catalog(None)
+        check['ok'] = check['ok'] and check['plan_catalog_warm']
+        checks['database'] = check
+
+    if key_ring.asymmetric:
+        jwks_loaded = bool(key_ring.public_jwks()['keys'])
+        checks['jwks'] = {'ok': jwks_loaded}
+
+    checks['lifecycle'] = {
+        'ok': not lifecycle.shutting_down,
+        'shutting_down': lifecycle.shutting_down,
+        'in_flight': lifecycle.in_flight
+    }
+
+    ready = all(check['ok'] for check in checks.values())
+    return jsonify({
+        'status': 'ready' if ready else 'not_ready',
+        'checks': checks
+    }), 200 if ready else 503
@@ -3,9 +3,13 @@
 from flask import Blueprint, request, jsonify, g
 import datetime
 
-from src.models import Plan, Subscription
+from src.models import Plan, Subscription, BillingRecord
 from src.config.database import db
 from src.controllers.auth import auth_required
+from src.services import prorate_plan_change, period_price, get_plan_catalog, event_log
+from src.services.events import (
+    SUBSCRIPTION_CREATED, SUBSCRIPTION_CANCELLED, PLAN_CHANGED, AUTO_RENEW_CHANGED
+)
 
 plans_bp = Blueprint('plans', __name__)
 
@@ -14,20 +18,7 @@ plans_bp = Blueprint('plans', __name__)
 @auth_required
 def get_plans():
     """Get all available subscription plans."""
-    plans = Plan.query.all()
-    out = []
-
-    for p in plans:
-        out.append({
-            'id': p.id,
-            'name': p.name,
-            'price': p.price,
-            'included_visits': 'Unlimited' if p.included_visits == float('inf') else p.included_visits,
-            'extra_visit_price': p.extra_visit_price,
-            'services': p.services()
-        })
-
-    return jsonify(out)
+    return jsonify(get_plan_catalog())
 
 
 @plans_bp.route('/subscriptions', methods=['GET'])
@@ -45,7 +36,10 @@ def get_user_subscriptions():
             'plan_id': sub.plan_id,
             'start_date': sub.start_date.isoformat(),
             'end_date': sub.end_date.isoformat(),
-            'active': sub.end_date >= datetime.date.today()
+            'period_days': sub.period_days,
+            'auto_renew': sub.auto_renew,
+            'cancelled_at': sub.cancelled_at.isoformat() if sub.cancelled_at else None,
+            'active': sub.is_active()
         })
 
     return jsonify(out)
@@ -58,17 +52,27 @@ def create_subscription():
     data = request.get_json() or {}
     plan_id = data.get('plan_id')
     duration_days = data.get('duration_days', 30)  # Default 30 days
+    auto_renew = data.get('auto_renew', True)
 
     if not plan_id:
         return jsonify({'message': 'plan_id is required'}), 400
 
+    if not isinstance(plan_id, int) or isinstance(plan_id, bool):
+        return jsonify({'message': 'plan_id must be an integer'}), 400
+
+    if not isinstance(duration_days, int) or isinstance(duration_days, bool) or duration_days <= 0:
+        return jsonify({'message': 'duration_days must be a positive integer'}), 400
+
+    if not isinstance(auto_renew, bool):
+        return jsonify({'message': 'auto_renew must be true or false'}), 400
+
     plan = Plan.query.get(plan_id)
     if not plan:
         return jsonify({'message': 'Plan not found'}), 404
 
     # Check for existing active subscription
     active_sub = Subscription.query.filter_by(user_id=g.user_id).filter(
-        Subscription.end_date >= datetime.date.today()
+        Subscription.active_filter()
     ).first()
 
     if active_sub:
@@ -82,25 +86,160 @@ def create_subscription():
         user_id=g.user_id,
         plan_id=plan_id,
         start_date=start_date,
-        end_date=end_date
+        end_date=end_date,
+        period_days=duration_days,
+        auto_renew=auto_renew
     )
 
     db.session.add(subscription)
+    db.session.flush()
+
+    amount = period_price(plan.price, duration_days)
+    db.session.add(BillingRecord(
+        subscription_id=subscription.id,
+        user_id=g.user_id,
+        plan_id=plan_id,
+        kind='initial',
+        amount=amount,
+        period_start=start_date,
+        period_end=end_date
+    ))
     db.session.commit()
 
+    event_log.append(
+        SUBSCRIPTION_CREATED, g.user_id, subscription.id,
+        plan_id=plan_id, amount=amount, start_date=start_date, end_date=end_date,
+        period_days=duration_days, auto_renew=auto_renew
+    )
+
     return jsonify({
         'message': 'Subscription created successfully',
         'subscription_id': subscription.id,
         'plan_name': plan.name,
         'start_date': start_date.isoformat(),
-        'end_date': end_date.isoformat()
+        'end_date': end_date.isoformat(),
+        'auto_renew': auto_renew
     }), 201
 
 
+@plans_bp.route('/subscriptions/<int:subscription_id>/plan', methods=['PUT'])
+@auth_required
+def change_subscription_plan(subscription_id):
+    """Upgrade or downgrade a subscription, prorating the current period."""
+    data = request.get_json() or {}
+    plan_id = data.get('plan_id')
+
+    if not plan_id:
+        return jsonify({'message': 'plan_id is required'}), 400
+
+    if not isinstance(plan_id, int) or isinstance(plan_id, bool):
+        return jsonify({'message': 'plan_id must be an integer'}), 400
+
+    subscription = Subscription.query.get(subscription_id)
+
+    if not subscription:
+        return jsonify({'message': 'Subscription not found'}), 404
+
+    if subscription.user_id != g.user_id:
+        return jsonify({'message': 'Unauthorized'}), 403
+
+    if not subscription.is_active():
+        return jsonify({'message': 'Subscription is not active'}), 400
+
+    if subscription.plan_id == plan_id:
+        return jsonify({'message': 'Subscription is already on this plan'}), 400
+
+    plan = Plan.query.get(plan_id)
+    if not plan:
+        return jsonify({'message': 'Plan not found'}), 404
+
+    old_plan_id = subscription.plan_id
+    record = prorate_plan_change(subscription, plan)
+    db.session.commit()
+
+    event_log.append(
+        PLAN_CHANGED, g.user_id, subscription.id,
+        from_plan_id=old_plan_id, to_plan_id=plan.id, amount=record.amount
+    )
+
+    return jsonify({
+        'message': 'Plan changed successfully',
+        'subscription_id': subscription.id,
+        'plan_name': plan.name,
+        'prorated_amount': record.amount,
+        'end_date': subscription.end_date.isoformat()
+    })
+
+
+@plans_bp.route('/subscriptions/<int:subscription_id>/auto-renew', methods=['PUT'])
+@auth_required
+def set_auto_renew(subscription_id):
+    """Turn automatic renewal on or off."""
+    data = request.get_json() or {}
+    if 'auto_renew' not in data:
+        return jsonify({'message': 'auto_renew is required'}), 400
+
+    if not isinstance(data['auto_renew'], bool):
+        return jsonify({'message': 'auto_renew must be true or false'}), 400
+
+    subscription = Subscription.query.get(subscription_id)
+
+    if not subscription:
+        return jsonify({'message': 'Subscription not found'}), 404
+
+    if subscription.user_id != g.user_id:
+        return jsonify({'message': 'Unauthorized'}), 403
+
+    if subscription.cancelled_at is not None:
+        return jsonify({'message': 'Subscription has been cancelled'}), 400
+
+    subscription.auto_renew = data['auto_renew']
+    db.session.commit()
+
+    event_log.append(AUTO_RENEW_CHANGED, g.user_id, subscription.id, auto_renew=subscription.auto_renew)
+
+    return jsonify({
+        'message': 'Auto-renew updated',
+        'subscription_id': subscription.id,
+        'auto_renew': subscription.auto_renew
+    })
+
+
+@plans_bp.route('/subscriptions/<int:subscription_id>/billing', methods=['GET'])
+@auth_required
+def get_billing_history(subscription_id):
+    """Get all charges and credits for a subscription."""
+    subscription = Subscription.query.get(subscription_id)
+
+    if not subscription:
+        return jsonify({'message': 'Subscription not found'}), 404
+
+    if subscription.user_id != g.user_id:
+        return jsonify({'message': 'Unauthorized'}), 403
+
+    records = BillingRecord.query.filter_by(subscription_id=subscription_id).order_by(
+        BillingRecord.created_at, BillingRecord.id
+    ).all()
+
+    return jsonify({
+        'subscription_id': subscription_id,
+        'records': [{
+            'id': r.id,
+            'kind': r.kind,
+            'plan_id': r.plan_id,
+            'amount': r.amount,
+            'period_start': r.period_start.isoformat(),
+            'period_end': r.period_end.isoformat(),
+            'created_at': r.created_at.isoformat()
+        } for r in records],
+        'total': round(sum(r.amount for r in records), 2)
+    })
+
+
 @plans_bp.route('/subscriptions/<int:subscription_id>', methods=['DELETE'])
 @auth_required
 def cancel_subscription(subscription_id):
-    """Cancel a subscription."""
+    """Cancel a subscription. The row is kept so visits and billing history stay intact."""
     subscription = Subscription.query.get(subscription_id)
 
     if not subscription:
@@ -109,7 +248,13 @@ def cancel_subscription(subscription_id):
     if subscription.user_id != g.user_id:
         return jsonify({'message': 'Unauthorized'}), 403
 
-    db.session.delete(subscription)
+    if subscription.cancelled_at:
+        return jsonify({'message': 'Subscription already cancelled'}), 400
+
+    subscription.cancelled_at = datetime.datetime.utcnow()
+    subscription.auto_renew = False
     db.session.commit()
 
+    event_log.append(SUBSCRIPTION_CANCELLED, g.user_id, subscription.id)
+
     return jsonify({'message': 'Subscription cancelled successfully'})
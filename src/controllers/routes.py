@@ -13,6 +13,8 @@ def register_blueprints(app: Flask):
     from src.controllers.auth import auth_bp
     from src.controllers.plans import plans_bp
     from src.controllers.visits import visits_bp
+    from src.controllers.admin import admin_bp
+    from src.controllers.health import health_bp
     
     # Register authentication routes
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
@@ -22,5 +24,11 @@ def register_blueprints(app: Flask):
     
     # Register visit tracking routes
     app.register_blueprint(visits_bp, url_prefix='/api')
+
+    # Register liveness/readiness probes at the root
+    app.register_blueprint(health_bp)
+
+    # Register operator routes
+    app.register_blueprint(admin_bp, url_prefix='/api/admin')
     
     print("✓ Registered all blueprints")
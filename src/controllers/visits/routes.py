@@ -6,6 +6,8 @@ import datetime
 from src.models import Visit, Subscription, Plan
 from src.config.database import db
 from src.controllers.auth import auth_required
+from src.services import record_visit_rollup, event_log
+from src.services.events import VISIT_RECORDED
 
 visits_bp = Blueprint('visits', __name__)
 
@@ -33,6 +35,9 @@ def record_visit():
         return jsonify({'message': 'Unauthorized - not your subscription'}), 403
     
     # Check if subscription is active
+    if subscription.cancelled_at:
+        return jsonify({'message': 'Subscription has been cancelled'}), 400
+
     if subscription.end_date < datetime.date.today():
         return jsonify({'message': 'Subscription has expired'}), 400
     
@@ -49,13 +54,17 @@ def record_visit():
     visit = Visit(
         user_id=g.user_id,
         subscription_id=subscription_id,
+        plan_id=plan.id,
         visit_date=datetime.datetime.utcnow(),
         cost=cost,
         notes=notes
     )
     
     db.session.add(visit)
+    record_visit_rollup(plan.id, visit.visit_date, cost)
     db.session.commit()
+
+    event_log.append(VISIT_RECORDED, g.user_id, subscription_id, visit_id=visit.id, plan_id=plan.id, cost=cost)
     
     # Determine if this was a free or paid visit
     is_included = cost == 0
@@ -87,7 +96,7 @@ def get_visit_summary():
     """
     # Get user's active subscriptions
     active_subs = Subscription.query.filter_by(user_id=g.user_id).filter(
-        Subscription.end_date >= datetime.date.today()
+        Subscription.active_filter()
     ).all()
     
     if not active_subs:
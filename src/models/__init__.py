@@ -4,5 +4,8 @@ from .user import User
 from .plan import Plan
 from .subscription import Subscription
 from .visit import Visit
+from .billing import BillingRecord
+from .usage import DailyPlanUsage
+from .event import BillingEvent
 
-__all__ = ['User', 'Plan', 'Subscription', 'Visit']
+__all__ = ['User', 'Plan', 'Subscription', 'Visit', 'BillingRecord', 'DailyPlanUsage', 'BillingEvent']
@@ -0,0 +1,22 @@
+"""Billing record model for subscription charges and credits."""
+
+import datetime
+from src.config.database import db
+
+
+class BillingRecord(db.Model):
+    """
+    A single charge or credit against a subscription.
+
+    Kinds: 'initial' (first period), 'renewal' (auto-renewed periods)
+    and 'proration' (mid-period plan change, negative for downgrades).
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    subscription_id = db.Column(db.Integer, db.ForeignKey('subscription.id'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    plan_id = db.Column(db.Integer, db.ForeignKey('plan.id'), nullable=False)
+    kind = db.Column(db.String(20), nullable=False)
+    amount = db.Column(db.Float, nullable=False)
+    period_start = db.Column(db.Date, nullable=False)
+    period_end = db.Column(db.Date, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.datetime.utcnow)
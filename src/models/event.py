@@ -0,0 +1,33 @@
+"""Append-only billing event model."""
+
+import datetime
+import json
+from sqlalchemy import event
+from src.config.database import db
+
+
+class BillingEvent(db.Model):
+    """
+    One billing-relevant change (visit recorded, subscription created,
+    cancelled, renewed, plan changed...). Rows are only ever inserted.
+    """
+    __table_args__ = (
+        db.Index('ix_billing_event_user_time', 'user_id', 'occurred_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    event_type = db.Column(db.String(40), nullable=False)
+    user_id = db.Column(db.Integer, nullable=False)
+    subscription_id = db.Column(db.Integer, nullable=True)
+    occurred_at = db.Column(db.DateTime, nullable=False, default=datetime.datetime.utcnow, index=True)
+    payload_json = db.Column(db.Text, nullable=False, default='{}')
+
+    def payload(self):
+        """Parse and return the event payload."""
+        return json.loads(self.payload_json)
+
+
+@event.listens_for(BillingEvent, 'before_update')
+@event.listens_for(BillingEvent, 'before_delete')
+def _reject_mutation(mapper, connection, target):
+    raise ValueError('BillingEvent rows are append-only')
@@ -10,7 +10,21 @@ class Subscription(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     plan_id = db.Column(db.Integer, db.ForeignKey('plan.id'), nullable=False)
     start_date = db.Column(db.Date, nullable=False)
-    end_date = db.Column(db.Date, nullable=False)
+    end_date = db.Column(db.Date, nullable=False, index=True)
+    period_days = db.Column(db.Integer, nullable=False, default=30)  # Length of one billing period
+    auto_renew = db.Column(db.Boolean, nullable=False, default=True)
+    cancelled_at = db.Column(db.DateTime, nullable=True)  # Soft-cancel marker, row is never deleted
+
+    @classmethod
+    def active_filter(cls, today=None):
+        """SQL condition matching subscriptions that are active on the given day."""
+        today = today or datetime.date.today()
+        return db.and_(cls.cancelled_at.is_(None), cls.end_date >= today)
+
+    def is_active(self, today=None):
+        """Check whether the subscription is active on the given day."""
+        today = today or datetime.date.today()
+        return self.cancelled_at is None and self.end_date >= today
     
     def get_visits_count(self):
         """Get total number of visits used in this subscription."""
@@ -0,0 +1,18 @@
+"""Daily usage rollup model for analytics."""
+
+from src.config.database import db
+
+
+class DailyPlanUsage(db.Model):
+    """
+    Visit totals per plan per day.
+
+    Maintained incrementally when a visit is recorded and rebuilt from
+    raw visits by the compaction job, so analytics never scan `visit`.
+    """
+    day = db.Column(db.Date, primary_key=True)
+    plan_id = db.Column(db.Integer, db.ForeignKey('plan.id'), primary_key=True)
+    visits = db.Column(db.Integer, nullable=False, default=0)
+    included_visits = db.Column(db.Integer, nullable=False, default=0)  # Covered by the plan (cost 0)
+    extra_visits = db.Column(db.Integer, nullable=False, default=0)
+    extra_charges = db.Column(db.Float, nullable=False, default=0.0)
@@ -9,6 +9,7 @@ class Visit(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     subscription_id = db.Column(db.Integer, db.ForeignKey('subscription.id'), nullable=False)
+    plan_id = db.Column(db.Integer, db.ForeignKey('plan.id'), nullable=True)  # Plan at visit time (NULL for older rows)
     visit_date = db.Column(db.DateTime, nullable=False, default=datetime.datetime.utcnow)
     cost = db.Column(db.Float, nullable=False, default=0.0)  # Cost charged (0 if within included visits)
     notes = db.Column(db.Text, nullable=True)  # Optional notes about the visit
@@ -0,0 +1,43 @@
+"""Business logic services package."""
+
+from .events import event_log, load_events, replay_events
+from .renewals import (
+    period_price,
+    prorate_plan_change,
+    process_due_renewals,
+    process_all_tenant_renewals,
+    start_renewal_scheduler
+)
+from .plan_catalog import get_plan_catalog
+from .metrics import tenant_metrics, init_request_metrics
+from .lifecycle import lifecycle, warm_caches, init_lifecycle, install_signal_handlers
+from .analytics import (
+    record_visit_rollup,
+    rebuild_daily_rollups,
+    visits_per_plan_per_day,
+    extra_revenue_by_month,
+    included_visit_utilization
+)
+
+__all__ = [
+    'event_log',
+    'load_events',
+    'replay_events',
+    'period_price',
+    'prorate_plan_change',
+    'process_due_renewals',
+    'process_all_tenant_renewals',
+    'start_renewal_scheduler',
+    'get_plan_catalog',
+    'tenant_metrics',
+    'init_request_metrics',
+    'lifecycle',
+    'warm_caches',
+    'init_lifecycle',
+    'install_signal_handlers',
+    'record_visit_rollup',
+    'rebuild_daily_rollups',
+    'visits_per_plan_per_day',
+    'extra_revenue_by_month',
+    'included_visit_utilization'
+]
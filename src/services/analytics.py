@@ -0,0 +1,284 @@
+"""Usage analytics served from the daily rollup table."""
+
+import datetime
+
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+
+from src.config.database import db
+from src.models import BillingRecord, DailyPlanUsage, Plan, Subscription, Visit
+
+_UPSERT_DIALECTS = {
+    'sqlite': sqlite.insert,
+    'postgresql': postgresql.insert
+}
+
+
+def record_visit_rollup(plan_id, visit_date, cost):
+    """
+    Add one visit to its day's rollup row in the current transaction.
+
+    Uses a single INSERT ... ON CONFLICT DO UPDATE statement, so no
+    read is needed. Other dialects fall back to UPDATE-then-INSERT.
+    """
+    values = {
+        'day': visit_date.date(),
+        'plan_id': plan_id,
+        'visits': 1,
+        'included_visits': 1 if cost == 0 else 0,
+        'extra_visits': 1 if cost > 0 else 0,
+        'extra_charges': cost
+    }
+
+    table = DailyPlanUsage.__table__
+    upsert = _UPSERT_DIALECTS.get(db.session.get_bind().dialect.name)
+    if upsert is None:
+        _increment_rollup(table, values)
+        return
+
+    stmt = upsert(table).values(**values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.day, table.c.plan_id],
+        set_={
+            'visits': table.c.visits + stmt.excluded.visits,
+            'included_visits': table.c.included_visits + stmt.excluded.included_visits,
+            'extra_visits': table.c.extra_visits + stmt.excluded.extra_visits,
+            'extra_charges': table.c.extra_charges + stmt.excluded.extra_charges
+        }
+    )
+    db.session.execute(stmt)
+
+
+def _increment_rollup(table, values):
+    """
+    Add `values` to an existing rollup row, or insert it if the day has
+    none yet. The insert runs in a savepoint; if a concurrent request
+    created the row first, the increment is retried.
+    """
+    increment = (
+        update(table)
+        .where(table.c.day == values['day'], table.c.plan_id == values['plan_id'])
+        .values(
+            visits=table.c.visits + values['visits'],
+            included_visits=table.c.included_visits + values['included_visits'],
+            extra_visits=table.c.extra_visits + values['extra_visits'],
+            extra_charges=table.c.extra_charges + values['extra_charges']
+        )
+    )
+    if db.session.execute(increment).rowcount:
+        return
+    try:
+        with db.session.begin_nested():
+            db.session.execute(insert(table).values(**values))
+    except IntegrityError:
+        db.session.execute(increment)
+
+
+def rebuild_daily_rollups(start, end):
+    """
+    Recompute the rollup rows for days `start`..`end` (inclusive) from raw visits.
+
+    Used to backfill existing data and as the periodic compaction job.
+    The range is replaced in one transaction with a set-based
+    INSERT ... SELECT. Visits are attributed to the plan recorded on the
+    visit, so plan changes do not move past usage; visits recorded before
+    that column existed fall back to their subscription's current plan.
+
+    Returns:
+        Number of rollup rows written.
+    """
+    range_start = datetime.datetime.combine(start, datetime.time.min)
+    range_end = datetime.datetime.combine(end + datetime.timedelta(days=1), datetime.time.min)
+    day = func.date(Visit.visit_date)
+    plan_id = func.coalesce(Visit.plan_id, Subscription.plan_id)
+
+    aggregated = (
+        select(
+            day,
+            plan_id,
+            func.count(Visit.id),
+            func.sum(case((Visit.cost == 0, 1), else_=0)),
+            func.sum(case((Visit.cost > 0, 1), else_=0)),
+            func.coalesce(func.sum(Visit.cost), 0.0)
+        )
+        .join(Subscription, Subscription.id == Visit.subscription_id)
+        .where(Visit.visit_date >= range_start, Visit.visit_date < range_end)
+        .group_by(day, plan_id)
+    )
+
+    db.session.execute(
+        delete(DailyPlanUsage).where(DailyPlanUsage.day >= start, DailyPlanUsage.day <= end)
+    )
+    result = db.session.execute(
+        insert(DailyPlanUsage).from_select(
+            ['day', 'plan_id', 'visits', 'included_visits', 'extra_visits', 'extra_charges'],
+            aggregated
+        )
+    )
+    db.session.commit()
+    return result.rowcount
+
+
+def _plan_names():
+    return dict(db.session.execute(select(Plan.id, Plan.name)).all())
+
+
+def _rollup_rows(start, end):
+    return DailyPlanUsage.query.filter(
+        DailyPlanUsage.day >= start,
+        DailyPlanUsage.day <= end
+    ).order_by(DailyPlanUsage.day, DailyPlanUsage.plan_id).all()
+
+
+def _month_key(day):
+    return day.strftime('%Y-%m')
+
+
+def _months_in_range(start, end):
+    """Yield (month_key, first_day, last_day) for every month touching the range."""
+    current = start.replace(day=1)
+    while current <= end:
+        next_month = (current + datetime.timedelta(days=32)).replace(day=1)
+        yield _month_key(current), current, next_month - datetime.timedelta(days=1)
+        current = next_month
+
+
+def visits_per_plan_per_day(start, end):
+    """Return visit counts per plan per day."""
+    names = _plan_names()
+    return [{
+        'day': row.day.isoformat(),
+        'plan_id': row.plan_id,
+        'plan_name': names.get(row.plan_id, 'Unknown'),
+        'visits': row.visits,
+        'included_visits': row.included_visits,
+        'extra_visits': row.extra_visits
+    } for row in _rollup_rows(start, end)]
+
+
+def extra_revenue_by_month(start, end):
+    """Return extra-visit charges per month."""
+    months = {}
+    for row in _rollup_rows(start, end):
+        month = months.setdefault(_month_key(row.day), {'extra_visits': 0, 'extra_charges': 0.0})
+        month['extra_visits'] += row.extra_visits
+        month['extra_charges'] += row.extra_charges
+
+    return [{
+        'month': key,
+        'extra_visits': months[key]['extra_visits'],
+        'extra_charges': round(months[key]['extra_charges'], 2)
+    } for key in sorted(months)]
+
+
+def _plan_periods(start, end):
+    """
+    Return (subscription_id, plan_id, first_day, last_day) for the days
+    each subscription spent on each plan within `start`..`end`.
+
+    Taken from billing records: every record covers its period on its
+    plan up to the day a later record of the same subscription starts,
+    since a proration moves the rest of the period to the new plan and
+    a renewal bills the next one. The changeover day counts for both
+    plans. Subscriptions without billing records
+    (created before they existed) count on their current plan. Days
+    after cancellation are excluded.
+    """
+    records = db.session.execute(
+        select(
+            BillingRecord.subscription_id,
+            BillingRecord.plan_id,
+            BillingRecord.period_start,
+            BillingRecord.period_end,
+            Subscription.cancelled_at
+        )
+        .join(Subscription, Subscription.id == BillingRecord.subscription_id)
+        .where(BillingRecord.period_start <= end, BillingRecord.period_end >= start)
+        .order_by(BillingRecord.subscription_id, BillingRecord.id.desc())
+    ).all()
+
+    legacy = db.session.execute(
+        select(
+            Subscription.id,
+            Subscription.plan_id,
+            Subscription.start_date,
+            Subscription.end_date,
+            Subscription.cancelled_at
+        )
+        .where(
+            Subscription.start_date <= end,
+            Subscription.end_date >= start,
+            ~select(BillingRecord.id).where(BillingRecord.subscription_id == Subscription.id).exists()
+        )
+    ).all()
+
+    periods = []
+    cut_sub_id, cut = None, None
+    for sub_id, plan_id, first_day, last_day, cancelled_at in records:
+        if sub_id != cut_sub_id:
+            cut_sub_id, cut = sub_id, None
+        if cut is not None:
+            last_day = min(last_day, cut)
+        cut = first_day if cut is None else min(cut, first_day)
+        periods.append((sub_id, plan_id, first_day, last_day, cancelled_at))
+    periods.extend(legacy)
+
+    out = []
+    for sub_id, plan_id, first_day, last_day, cancelled_at in periods:
+        if cancelled_at is not None:
+            last_day = min(last_day, cancelled_at.date())
+        first_day, last_day = max(first_day, start), min(last_day, end)
+        if first_day <= last_day:
+            out.append((sub_id, plan_id, first_day, last_day))
+    return out
+
+
+def included_visit_utilization(start, end):
+    """
+    Return, per plan and month, how much of the included visit allowance
+    was used.
+
+    Allowance is included_visits multiplied by the number of
+    subscriptions that were on the plan at some point during the month.
+    Like the usage, which counts each visit toward the plan it was
+    recorded under, this follows plan changes: a subscription that
+    upgraded mid-month counts toward both plans that month. It is
+    derived from `billing_record`, whose size does not grow with visit
+    volume. Unlimited plans are skipped.
+    """
+    plans = {p.id: p for p in Plan.query.all() if p.included_visits != float('inf')}
+
+    used = {}
+    for row in _rollup_rows(start, end):
+        if row.plan_id in plans:
+            key = (_month_key(row.day), row.plan_id)
+            used[key] = used.get(key, 0) + row.included_visits
+
+    months = list(_months_in_range(start, end))
+    if not months:
+        return []
+
+    subscribers = {}
+    for sub_id, plan_id, first_day, last_day in _plan_periods(months[0][1], months[-1][2]):
+        for month, month_start, month_end in months:
+            if first_day <= month_end and last_day >= month_start:
+                subscribers.setdefault((month, plan_id), set()).add(sub_id)
+
+    out = []
+    for month, _, _ in months:
+        for plan_id, plan in sorted(plans.items()):
+            subscriptions = len(subscribers.get((month, plan_id), ()))
+            allowance = int(plan.included_visits * subscriptions)
+            included_used = used.get((month, plan_id), 0)
+            out.append({
+                'month': month,
+                'plan_id': plan_id,
+                'plan_name': plan.name,
+                'active_subscriptions': subscriptions,
+                'included_allowance': allowance,
+                'included_visits_used': included_used,
+                'utilization': round(included_used / allowance, 4) if allowance else None
+            })
+
+    return out
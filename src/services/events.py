@@ -0,0 +1,225 @@
+"""
+Append-only billing event log.
+
+Events are appended to an in-memory buffer and written by a background
+thread in batched INSERTs (one transaction per tenant per flush), so
+recording an event adds no synchronous commit to the request path. The
+buffer is flushed on graceful shutdown and at interpreter exit; events
+still buffered when the process crashes are lost.
+"""
+
+import atexit
+import datetime
+import json
+import threading
+
+from flask import g, has_app_context
+from sqlalchemy import insert
+
+from src.config.database import db
+from src.config.settings import settings
+from src.config.tenants import tenant_registry
+from src.models import BillingEvent
+
+VISIT_RECORDED = 'visit_recorded'
+SUBSCRIPTION_CREATED = 'subscription_created'
+SUBSCRIPTION_CANCELLED = 'subscription_cancelled'
+SUBSCRIPTION_RENEWED = 'subscription_renewed'
+PLAN_CHANGED = 'plan_changed'
+AUTO_RENEW_CHANGED = 'auto_renew_changed'
+
+
+def _to_columns(row):
+    """Turn a buffered event row into BillingEvent column values."""
+    values = dict(row)
+    values['payload_json'] = json.dumps(values.pop('payload'), default=str)
+    return values
+
+
+class EventLog:
+    """Buffered, batched appender for BillingEvent rows."""
+
+    def __init__(self, batch_size=500, flush_interval=0.5, max_buffered=100000):
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._max_buffered = max_buffered
+        self._buffer = []  # (tenant_id, row) pairs in append order
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._app = None
+
+    def init_app(self, app):
+        """Start the background flusher and flush once more at exit."""
+        self._app = app
+        thread = threading.Thread(target=self._run, name='event-log-flusher', daemon=True)
+        thread.start()
+        atexit.register(self.flush)
+        return thread
+
+    def append(self, event_type, user_id, subscription_id=None, **payload):
+        """Buffer one event for the current tenant. Never touches the database."""
+        tenant_id = g.get('tenant_id') if has_app_context() else None
+        row = {
+            'event_type': event_type,
+            'user_id': user_id,
+            'subscription_id': subscription_id,
+            'occurred_at': datetime.datetime.utcnow(),
+            'payload': payload  # serialised by the flusher, off the caller's thread
+        }
+        with self._lock:
+            self._buffer.append((tenant_id, row))
+            full = len(self._buffer) >= self._batch_size
+        if full:
+            self._wakeup.set()
+
+    @property
+    def pending(self):
+        """Number of buffered events not yet written."""
+        return len(self._buffer)
+
+    def flush(self):
+        """
+        Write all buffered events. Batches that fail are put back at the
+        front of the buffer and retried on the next flush. If the buffer
+        then holds more than `max_buffered` events, the oldest are
+        dropped so a long database outage cannot exhaust memory.
+
+        Returns:
+            Number of events written.
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending, self._buffer = self._buffer, []
+            if not pending:
+                return 0
+
+            by_tenant = {}
+            for tenant_id, row in pending:
+                by_tenant.setdefault(tenant_id, []).append(row)
+
+            written = 0
+            failed = []
+            for tenant_id, rows in by_tenant.items():
+                try:
+                    values = [_to_columns(row) for row in rows]
+                    with self._engine(tenant_id).begin() as conn:
+                        conn.execute(insert(BillingEvent.__table__), values)
+                    written += len(rows)
+                except Exception as exc:
+                    print(f"⚠️  Event log flush failed for {tenant_id or 'default'}: {exc}")
+                    failed.extend((tenant_id, row) for row in rows)
+
+            if failed:
+                with self._lock:
+                    self._buffer[:0] = failed
+                    dropped = max(0, len(self._buffer) - self._max_buffered)
+                    if dropped:
+                        del self._buffer[:dropped]
+                if dropped:
+                    print(f"⚠️  Event log buffer full, dropped {dropped} oldest events")
+            return written
+
+    def _engine(self, tenant_id):
+        if tenant_id:
+            return tenant_registry.get_engine(tenant_id)
+        if has_app_context():
+            return db.engine
+        with self._app.app_context():
+            return db.engine
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self._flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+
+def load_events(user_id=None, start=None, end=None, after_id=0, limit=None):
+    """
+    Read events in append order, optionally for one user and a time range.
+
+    Range reads by user use the (user_id, occurred_at) index; `after_id`
+    gives keyset pagination.
+    """
+    query = BillingEvent.query.filter(BillingEvent.id > after_id)
+    if user_id is not None:
+        query = query.filter(BillingEvent.user_id == user_id)
+    if start is not None:
+        query = query.filter(BillingEvent.occurred_at >= start)
+    if end is not None:
+        query = query.filter(BillingEvent.occurred_at < end)
+    query = query.order_by(BillingEvent.id)
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
+
+def replay_events(events):
+    """
+    Fold events into per-subscription usage counters and billing ledgers.
+
+    Rebuilds state from the log alone, e.g. to audit or repair the
+    `visit`, `billing_record` and rollup tables.
+
+    Returns:
+        {subscription_id: {'status', 'plan_id', 'usage': {month: counters},
+                           'ledger': [entries], 'balance'}}
+    """
+    state = {}
+
+    for ev in events:
+        payload = ev.payload()
+        sub = state.setdefault(ev.subscription_id, {
+            'user_id': ev.user_id,
+            'status': 'active',
+            'plan_id': None,
+            'usage': {},
+            'ledger': [],
+            'balance': 0.0
+        })
+
+        amount = None
+        if ev.event_type == SUBSCRIPTION_CREATED:
+            sub['plan_id'] = payload.get('plan_id')
+            amount = payload.get('amount', 0)
+        elif ev.event_type == PLAN_CHANGED:
+            sub['plan_id'] = payload.get('to_plan_id')
+            amount = payload.get('amount', 0)
+        elif ev.event_type == SUBSCRIPTION_RENEWED:
+            amount = payload.get('amount', 0)
+        elif ev.event_type == SUBSCRIPTION_CANCELLED:
+            sub['status'] = 'cancelled'
+        elif ev.event_type == VISIT_RECORDED:
+            cost = payload.get('cost', 0)
+            month = sub['usage'].setdefault(ev.occurred_at.strftime('%Y-%m'), {
+                'visits': 0,
+                'included_visits': 0,
+                'extra_visits': 0,
+                'extra_charges': 0.0
+            })
+            month['visits'] += 1
+            if cost > 0:
+                month['extra_visits'] += 1
+                month['extra_charges'] += cost
+                amount = cost
+            else:
+                month['included_visits'] += 1
+
+        if amount:
+            sub['ledger'].append({
+                'event_id': ev.id,
+                'event_type': ev.event_type,
+                'occurred_at': ev.occurred_at.isoformat(),
+                'amount': amount
+            })
+            sub['balance'] = round(sub['balance'] + amount, 2)
+
+    return state
+
+
+event_log = EventLog(
+    settings.EVENT_BATCH_SIZE,
+    settings.EVENT_FLUSH_INTERVAL_SECONDS,
+    settings.EVENT_BUFFER_MAX
+)
@@ -0,0 +1,142 @@
+"""Process lifecycle: cache warm-up, in-flight tracking and graceful shutdown."""
+
+import _thread
+import signal
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import g, jsonify, request
+
+from src.config.database import db
+from src.config.jwt_keys import key_ring
+from src.config.tenants import tenant_registry, tenant_context
+from src.services.events import event_log
+
+# Paths that keep answering while draining so orchestrators can observe the state
+HEALTH_PATHS = ('/healthz', '/readyz')
+
+
+class Lifecycle:
+    """Tracks in-flight work and the draining state of this worker."""
+
+    def __init__(self):
+        self._in_flight = 0
+        self._condition = threading.Condition()
+        self.shutting_down = False  # readiness fails, work is still accepted
+        self.draining = False  # new work is rejected
+
+    @property
+    def in_flight(self):
+        """Number of requests and jobs currently running."""
+        return self._in_flight
+
+    def begin(self):
+        """Mark one unit of work as started."""
+        with self._condition:
+            self._in_flight += 1
+
+    def end(self):
+        """Mark one unit of work as finished."""
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    @contextmanager
+    def track(self):
+        """Count the wrapped block as in-flight work."""
+        self.begin()
+        try:
+            yield
+        finally:
+            self.end()
+
+    def wait_idle(self, timeout):
+        """Block until no work is in flight or `timeout` expires. Returns True if idle."""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while self._in_flight > 0:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+
+lifecycle = Lifecycle()
+
+
+def warm_caches():
+    """
+    Load plan catalogs (and the JWKS, if used) before the worker reports
+    ready. Must be called inside an app context.
+    """
+    from src.services.plan_catalog import get_plan_catalog
+
+    for tenant_id in tenant_registry.tenant_ids() or [None]:
+        with tenant_context(tenant_id):
+            get_plan_catalog()
+
+    if key_ring.asymmetric:
+        key_ring.public_jwks()
+
+
+def init_lifecycle(app):
+    """Register hooks that track requests and reject new work while draining."""
+
+    @app.before_request
+    def _begin_request():
+        if request.path in HEALTH_PATHS:
+            return None
+        if lifecycle.draining:
+            resp = jsonify({'message': 'Server is shutting down'})
+            resp.headers['Retry-After'] = '1'
+            resp.headers['Connection'] = 'close'
+            return resp, 503
+        lifecycle.begin()
+        g.lifecycle_tracked = True
+        return None
+
+    @app.teardown_request
+    def _end_request(exc=None):
+        if g.pop('lifecycle_tracked', False):
+            lifecycle.end()
+
+
+def install_signal_handlers(app, drain_seconds, grace_seconds):
+    """
+    Shut down gracefully on SIGTERM (for `python app.py`; gunicorn
+    handles worker signals itself).
+
+    1. Readiness fails immediately. Requests are still served for
+       `drain_seconds` so the load balancer can stop routing here.
+    2. New requests then get 503. In-flight requests, and renewal runs
+       holding a tracker, get up to `grace_seconds` to finish their
+       commits.
+    3. Buffered billing events are flushed, connection pools are
+       disposed and the server loop is stopped.
+    """
+    def shutdown():
+        time.sleep(drain_seconds)
+        lifecycle.draining = True
+        if not lifecycle.wait_idle(grace_seconds):
+            print(f"⚠️  Shutdown grace period expired with {lifecycle.in_flight} requests in flight")
+        with app.app_context():
+            event_log.flush()
+            db.engine.dispose()
+        for engine in tenant_registry.engines().values():
+            engine.dispose()
+        print("✓ Drained, exiting")
+        # Raises KeyboardInterrupt in the main thread, which stops the server loop
+        _thread.interrupt_main()
+
+    def handle(signum, frame):
+        if lifecycle.shutting_down:
+            return
+        lifecycle.shutting_down = True
+        print(f"✓ Received signal {signum}, draining")
+        threading.Thread(target=shutdown, name='graceful-shutdown', daemon=True).start()
+
+    signal.signal(signal.SIGTERM, handle)
+    # interrupt_main() is a no-op while SIGINT is ignored (e.g. background jobs)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
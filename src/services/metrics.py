@@ -0,0 +1,92 @@
+"""Per-tenant request and job metrics for spotting noisy neighbours."""
+
+import threading
+import time
+
+from flask import g
+
+
+class TenantMetrics:
+    """In-process counters of request load and batch job time per tenant."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests = {}
+        self._jobs = {}
+
+    def record_request(self, tenant_id, duration, status_code):
+        """Record one finished request."""
+        with self._lock:
+            stats = self._requests.setdefault(tenant_id, {
+                'requests': 0,
+                'errors': 0,
+                'total_seconds': 0.0,
+                'max_seconds': 0.0
+            })
+            stats['requests'] += 1
+            if status_code >= 500:
+                stats['errors'] += 1
+            stats['total_seconds'] += duration
+            stats['max_seconds'] = max(stats['max_seconds'], duration)
+
+    def record_job(self, tenant_id, name, duration, rows):
+        """Record one batch job run (e.g. renewals) for a tenant."""
+        with self._lock:
+            stats = self._jobs.setdefault(tenant_id, {}).setdefault(name, {
+                'runs': 0,
+                'rows': 0,
+                'total_seconds': 0.0,
+                'last_seconds': 0.0
+            })
+            stats['runs'] += 1
+            stats['rows'] += rows
+            stats['total_seconds'] += duration
+            stats['last_seconds'] = duration
+
+    def snapshot(self, engines=None):
+        """
+        Return a JSON-serialisable view of all counters.
+
+        Args:
+            engines: Optional {tenant_id: engine} mapping whose pool usage is included
+        """
+        engines = engines or {}
+        with self._lock:
+            tenants = set(self._requests) | set(self._jobs) | set(engines)
+            out = {}
+            for tenant_id in sorted(tenants, key=lambda t: t or ''):
+                requests = dict(self._requests.get(tenant_id, {}))
+                if requests:
+                    requests['avg_ms'] = round(requests['total_seconds'] / requests['requests'] * 1000, 2)
+                entry = {
+                    'requests': requests,
+                    'jobs': {name: dict(stats) for name, stats in self._jobs.get(tenant_id, {}).items()}
+                }
+                engine = engines.get(tenant_id)
+                if engine is not None:
+                    entry['pool'] = {
+                        'checked_out': engine.pool.checkedout(),
+                        'size': engine.pool.size()
+                    }
+                out[tenant_id or 'default'] = entry
+            return out
+
+
+tenant_metrics = TenantMetrics()
+
+
+def init_request_metrics(app):
+    """Register hooks timing every request against the resolved tenant."""
+
+    @app.before_request
+    def _start_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        started = g.get('request_started')
+        if started is not None:
+            tenant_metrics.record_request(
+                g.get('tenant_id'), time.perf_counter() - started, response.status_code
+            )
+        return response
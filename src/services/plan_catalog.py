@@ -0,0 +1,21 @@
+"""Cached, per-tenant plan catalog."""
+
+from src.config.tenants import tenant_registry, current_tenant_id
+from src.models import Plan
+
+
+def _load_catalog():
+    """Serialise every plan of the current tenant."""
+    return [{
+        'id': p.id,
+        'name': p.name,
+        'price': p.price,
+        'included_visits': 'Unlimited' if p.included_visits == float('inf') else p.included_visits,
+        'extra_visit_price': p.extra_visit_price,
+        'services': p.services()
+    } for p in Plan.query.order_by(Plan.id).all()]
+
+
+def get_plan_catalog():
+    """Return the current tenant's plans, loading them from the database once."""
+    return tenant_registry.get_plan_catalog(current_tenant_id(), _load_catalog)
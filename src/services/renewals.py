@@ -0,0 +1,245 @@
+"""Subscription renewal and plan-change engine."""
+
+import datetime
+import threading
+import time
+
+from sqlalchemy import bindparam, insert, select, update
+
+from src.config.database import db
+from src.config.tenants import tenant_registry, tenant_context
+from src.models import BillingRecord, Plan, Subscription
+from src.services.metrics import tenant_metrics
+from src.services.events import event_log, SUBSCRIPTION_RENEWED
+
+# Plan prices are monthly; charges for other period lengths are scaled from this
+BILLING_MONTH_DAYS = 30
+
+
+# Extends one subscription only if no other renewal run has moved its end_date yet
+_RENEW_SUBSCRIPTION = (
+    update(Subscription.__table__)
+    .where(
+        Subscription.__table__.c.id == bindparam('sub_id'),
+        Subscription.__table__.c.end_date == bindparam('old_end_date')
+    )
+    .values(end_date=bindparam('new_end_date'))
+)
+
+
+def period_price(monthly_price, period_days):
+    """Price of one billing period of `period_days` for a monthly plan price."""
+    return round(monthly_price * period_days / BILLING_MONTH_DAYS, 2)
+
+
+def prorate_plan_change(subscription, new_plan, today=None):
+    """
+    Switch a subscription to another plan mid-period.
+
+    The monthly price difference is charged (upgrade) or credited
+    (downgrade) pro rata for the days left in the current period,
+    including today. The caller is responsible for committing the
+    session and, once committed, appending the PLAN_CHANGED event.
+
+    Returns:
+        The BillingRecord describing the proration.
+    """
+    today = today or datetime.date.today()
+    old_plan = Plan.query.get(subscription.plan_id)
+    old_price = old_plan.price if old_plan else 0
+
+    remaining_days = (subscription.end_date - today).days + 1
+    remaining_days = max(0, min(remaining_days, subscription.period_days))
+    amount = round((new_plan.price - old_price) * remaining_days / BILLING_MONTH_DAYS, 2)
+
+    subscription.plan_id = new_plan.id
+    record = BillingRecord(
+        subscription_id=subscription.id,
+        user_id=subscription.user_id,
+        plan_id=new_plan.id,
+        kind='proration',
+        amount=amount,
+        period_start=today,
+        period_end=subscription.end_date
+    )
+    db.session.add(record)
+    return record
+
+
+def _renew_batch(rows, as_of, now):
+    """
+    Build subscription updates and billing rows for one batch of due subscriptions.
+
+    Each subscription is renewed for exactly one period. A subscription
+    that lapsed a full period or more before `as_of` is not renewed or
+    billed for the missed time; its id is returned in `lapsed_ids` so
+    auto-renew can be switched off.
+
+    Returns:
+        (sub_updates, billing_rows, lapsed_ids)
+    """
+    sub_updates = []
+    billing_rows = []
+    lapsed_ids = []
+
+    for sub_id, user_id, plan_id, end_date, period_days, price in rows:
+        if (as_of - end_date).days >= period_days:
+            lapsed_ids.append(sub_id)
+            continue
+
+        new_end = end_date + datetime.timedelta(days=period_days)
+        sub_updates.append({'sub_id': sub_id, 'old_end_date': end_date, 'new_end_date': new_end})
+        billing_rows.append({
+            'subscription_id': sub_id,
+            'user_id': user_id,
+            'plan_id': plan_id,
+            'kind': 'renewal',
+            'amount': period_price(price, period_days),
+            'period_start': end_date + datetime.timedelta(days=1),
+            'period_end': new_end,
+            'created_at': now
+        })
+
+    return sub_updates, billing_rows, lapsed_ids
+
+
+def _apply_renewals(sub_updates, billing_rows):
+    """
+    Extend subscriptions guarded by their old end_date and return the
+    billing rows of those that were actually extended.
+
+    The whole batch is tried as one executemany. If the total row count
+    shows that a concurrent run already renewed some rows, the batch is
+    rolled back and replayed row by row so only rows this run changed
+    are billed.
+    """
+    if db.session.get_bind().dialect.supports_sane_multi_rowcount:
+        result = db.session.execute(_RENEW_SUBSCRIPTION, sub_updates)
+        if result.rowcount == len(sub_updates):
+            return billing_rows
+        db.session.rollback()
+
+    applied = []
+    for params, billing_row in zip(sub_updates, billing_rows):
+        if db.session.execute(_RENEW_SUBSCRIPTION, params).rowcount == 1:
+            applied.append(billing_row)
+    return applied
+
+
+def process_due_renewals(as_of=None, batch_size=5000):
+    """
+    Renew every auto-renewing subscription whose period ends on or
+    before `as_of` by one period. Renewing on the last day keeps the
+    subscription active without a gap, as long as this runs at least
+    daily. Subscriptions that lapsed a full period or more ago have
+    auto-renew switched off instead of being billed for the missed
+    periods.
+
+    Due subscriptions are read in keyset-paginated batches of plain
+    column tuples, and each batch is written back with one bulk UPDATE
+    and one bulk INSERT followed by a single commit. The UPDATE only
+    matches rows whose end_date is unchanged, so overlapping runs never
+    bill the same renewal twice. Must be called inside an app context.
+
+    Returns:
+        Number of subscriptions renewed.
+    """
+    as_of = as_of or datetime.date.today()
+    now = datetime.datetime.utcnow()
+    renewed = 0
+    last_id = 0
+
+    while True:
+        rows = db.session.execute(
+            select(
+                Subscription.id,
+                Subscription.user_id,
+                Subscription.plan_id,
+                Subscription.end_date,
+                Subscription.period_days,
+                Plan.price
+            )
+            .join(Plan, Plan.id == Subscription.plan_id)
+            .where(
+                Subscription.id > last_id,
+                Subscription.auto_renew.is_(True),
+                Subscription.cancelled_at.is_(None),
+                Subscription.end_date <= as_of
+            )
+            .order_by(Subscription.id)
+            .limit(batch_size)
+        ).all()
+
+        if not rows:
+            break
+
+        sub_updates, billing_rows, lapsed_ids = _renew_batch(rows, as_of, now)
+        if sub_updates:
+            billing_rows = _apply_renewals(sub_updates, billing_rows)
+            if billing_rows:
+                db.session.execute(insert(BillingRecord), billing_rows)
+        if lapsed_ids:
+            db.session.execute(
+                update(Subscription).where(Subscription.id.in_(lapsed_ids)).values(auto_renew=False)
+            )
+        db.session.commit()
+
+        for row in billing_rows:
+            event_log.append(
+                SUBSCRIPTION_RENEWED, row['user_id'], row['subscription_id'],
+                plan_id=row['plan_id'], amount=row['amount'],
+                period_start=row['period_start'], period_end=row['period_end']
+            )
+
+        renewed += len(billing_rows)
+        last_id = rows[-1][0]
+
+    return renewed
+
+
+def process_all_tenant_renewals(batch_size=5000):
+    """
+    Run `process_due_renewals` for every tenant, one tenant at a time.
+
+    Each tenant's run is timed into the per-tenant job metrics. Without
+    tenants configured, the default database is processed.
+
+    Returns:
+        {tenant_id: renewed_count}
+    """
+    results = {}
+    for tenant_id in tenant_registry.tenant_ids() or [None]:
+        with tenant_context(tenant_id):
+            started = time.perf_counter()
+            renewed = process_due_renewals(batch_size=batch_size)
+            tenant_metrics.record_job(tenant_id, 'renewals', time.perf_counter() - started, renewed)
+        results[tenant_id] = renewed
+    return results
+
+
+def start_renewal_scheduler(app, interval_seconds, batch_size=5000):
+    """
+    Run renewals for every tenant periodically in a daemon thread.
+
+    Intended for single-process deployments; with several workers,
+    prefer running scripts/process_renewals.py from cron instead.
+    """
+    from src.services.lifecycle import lifecycle
+
+    def run():
+        while True:
+            time.sleep(interval_seconds)
+            if lifecycle.shutting_down:
+                return
+            with lifecycle.track(), app.app_context():
+                try:
+                    renewed = sum(process_all_tenant_renewals(batch_size=batch_size).values())
+                    if renewed:
+                        print(f"✓ Renewed {renewed} subscriptions")
+                except Exception as exc:
+                    db.session.rollback()
+                    print(f"⚠️  Renewal run failed: {exc}")
+
+    thread = threading.Thread(target=run, name='renewal-scheduler', daemon=True)
+    thread.start()
+    return thread
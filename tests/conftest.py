@@ -0,0 +1,96 @@
+"""Shared fixtures: a minimal app bound to a throwaway SQLite database."""
+
+import datetime
+import functools
+import os
+import sys
+
+import bcrypt
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+
+from src.config.database import db
+from src.config.settings import settings
+from src.config.tenants import tenant_registry
+from src.controllers.routes import register_blueprints
+from src.models import User, Subscription
+from src.services import init_lifecycle
+from scripts.init_data import init_default_plans
+
+ADMIN_KEY = 'test-admin-key'
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """App context with all tables created and the default plans seeded."""
+    monkeypatch.setattr(tenant_registry, '_plan_catalogs', {})
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'test.db'}"
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        init_default_plans()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app, monkeypatch):
+    """Test client for the app with every blueprint and lifecycle hook registered."""
+    monkeypatch.setattr(settings, 'ADMIN_API_KEY', ADMIN_KEY)
+    # Cheapest bcrypt cost, so signups don't dominate the test run
+    monkeypatch.setattr(bcrypt, 'gensalt', functools.partial(bcrypt.gensalt, rounds=4))
+    register_blueprints(app)
+    init_lifecycle(app)
+    return app.test_client()
+
+
+@pytest.fixture
+def admin_headers():
+    """Headers authenticating as the operator."""
+    return {'X-Admin-Key': ADMIN_KEY}
+
+
+@pytest.fixture
+def tenants(app, tmp_path, monkeypatch):
+    """Configure tenants 'clinic-a' and 'clinic-b', each with its own SQLite file."""
+    monkeypatch.setattr(tenant_registry, '_tenant_ids', ['clinic-a', 'clinic-b'])
+    monkeypatch.setattr(tenant_registry, '_uri_template', f"sqlite:///{tmp_path}/{{tenant}}.db")
+    monkeypatch.setattr(tenant_registry, '_engines', {})
+    yield tenant_registry
+    for engine in tenant_registry.engines().values():
+        engine.dispose()
+
+
+@pytest.fixture
+def user(app):
+    """A saved user."""
+    user = User(username='alice', password=b'x')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture
+def make_subscription(user):
+    """Factory for saved subscriptions of `user`."""
+    def make(plan_id=1, end_date=None, period_days=30, auto_renew=True):
+        end_date = end_date or datetime.date.today() + datetime.timedelta(days=period_days - 1)
+        subscription = Subscription(
+            user_id=user.id,
+            plan_id=plan_id,
+            start_date=end_date - datetime.timedelta(days=period_days - 1),
+            end_date=end_date,
+            period_days=period_days,
+            auto_renew=auto_renew
+        )
+        db.session.add(subscription)
+        db.session.commit()
+        return subscription
+    return make
@@ -0,0 +1,173 @@
+"""Tests for the daily usage rollups and the analytics queries."""
+
+import datetime
+
+import pytest
+
+from src.config.database import db
+from src.models import BillingRecord, DailyPlanUsage, Visit
+from src.services import (
+    extra_revenue_by_month, included_visit_utilization, rebuild_daily_rollups,
+    record_visit_rollup, visits_per_plan_per_day
+)
+from src.services import analytics
+
+DAY = datetime.date(2025, 11, 5)
+
+
+def at(day, hour=12):
+    return datetime.datetime.combine(day, datetime.time(hour))
+
+
+def add_visit(subscription, day, cost=0.0, plan_id=None):
+    db.session.add(Visit(
+        user_id=subscription.user_id,
+        subscription_id=subscription.id,
+        plan_id=plan_id,
+        visit_date=at(day),
+        cost=cost
+    ))
+
+
+def add_billing(subscription, plan_id, kind, first_day, last_day):
+    db.session.add(BillingRecord(
+        subscription_id=subscription.id,
+        user_id=subscription.user_id,
+        plan_id=plan_id,
+        kind=kind,
+        amount=0,
+        period_start=first_day,
+        period_end=last_day
+    ))
+
+
+def rollup_counts():
+    return [
+        (r.day, r.plan_id, r.visits, r.included_visits, r.extra_visits, r.extra_charges)
+        for r in DailyPlanUsage.query.order_by(DailyPlanUsage.day, DailyPlanUsage.plan_id)
+    ]
+
+
+@pytest.mark.parametrize('upsert', [True, False], ids=['on-conflict', 'update-then-insert'])
+def test_record_visit_rollup_accumulates_into_one_row_per_day_and_plan(app, monkeypatch, upsert):
+    if not upsert:
+        monkeypatch.setattr(analytics, '_UPSERT_DIALECTS', {})
+
+    for cost in (0, 0, 15.0):
+        record_visit_rollup(1, at(DAY), cost)
+        db.session.commit()
+    record_visit_rollup(2, at(DAY), 0)
+    db.session.commit()
+
+    assert rollup_counts() == [(DAY, 1, 3, 2, 1, 15.0), (DAY, 2, 1, 1, 0, 0.0)]
+
+
+def test_rebuild_attributes_visits_to_plan_at_visit_time(make_subscription):
+    subscription = make_subscription(plan_id=2)
+    add_visit(subscription, DAY, plan_id=1)
+    add_visit(subscription, DAY, cost=20.0, plan_id=2)
+    add_visit(subscription, DAY)  # recorded before visits stored their plan
+    add_visit(subscription, DAY + datetime.timedelta(days=5), plan_id=1)
+    db.session.commit()
+
+    assert rebuild_daily_rollups(DAY, DAY) == 2
+
+    assert rollup_counts() == [(DAY, 1, 1, 1, 0, 0.0), (DAY, 2, 2, 1, 1, 20.0)]
+
+
+def test_rebuild_replaces_existing_rows_in_range(make_subscription):
+    subscription = make_subscription(plan_id=1)
+    record_visit_rollup(1, at(DAY), 0)
+    record_visit_rollup(3, at(DAY), 0)
+    add_visit(subscription, DAY, plan_id=1)
+    db.session.commit()
+
+    rebuild_daily_rollups(DAY, DAY)
+
+    assert rollup_counts() == [(DAY, 1, 1, 1, 0, 0.0)]
+
+
+def test_visit_and_revenue_queries_read_rollups(app):
+    record_visit_rollup(1, at(DAY), 0)
+    record_visit_rollup(1, at(DAY), 15.0)
+    record_visit_rollup(2, at(datetime.date(2025, 12, 1)), 20.0)
+    db.session.commit()
+
+    days = visits_per_plan_per_day(datetime.date(2025, 11, 1), datetime.date(2025, 12, 31))
+    assert [(d['day'], d['plan_name'], d['visits'], d['extra_visits']) for d in days] == [
+        ('2025-11-05', 'Lite Care Pack', 2, 1),
+        ('2025-12-01', 'Standard Health Pack', 1, 1),
+    ]
+
+    months = extra_revenue_by_month(datetime.date(2025, 11, 1), datetime.date(2025, 12, 31))
+    assert months == [
+        {'month': '2025-11', 'extra_visits': 1, 'extra_charges': 15.0},
+        {'month': '2025-12', 'extra_visits': 1, 'extra_charges': 20.0},
+    ]
+
+
+def utilization(start, end):
+    return {
+        (row['month'], row['plan_id']): (row['active_subscriptions'], row['included_allowance'],
+                                          row['included_visits_used'])
+        for row in included_visit_utilization(start, end)
+    }
+
+
+def test_utilization_follows_plan_changes(make_subscription):
+    # Lite (2 included) from Nov 1, upgraded to Standard (4 included) on Nov 10
+    subscription = make_subscription(plan_id=2, end_date=datetime.date(2025, 11, 30))
+    add_billing(subscription, 1, 'initial', datetime.date(2025, 11, 1), datetime.date(2025, 11, 30))
+    add_billing(subscription, 2, 'proration', datetime.date(2025, 11, 10), datetime.date(2025, 11, 30))
+    add_billing(subscription, 2, 'renewal', datetime.date(2025, 12, 1), datetime.date(2025, 12, 30))
+    record_visit_rollup(1, at(DAY), 0)
+    record_visit_rollup(1, at(DAY), 0)
+    db.session.commit()
+
+    rows = utilization(datetime.date(2025, 11, 1), datetime.date(2025, 12, 31))
+
+    assert rows[('2025-11', 1)] == (1, 2, 2)
+    assert rows[('2025-11', 2)] == (1, 4, 0)
+    assert rows[('2025-12', 1)] == (0, 0, 0)
+    assert rows[('2025-12', 2)] == (1, 4, 0)
+
+
+def test_utilization_proration_overrides_an_already_issued_renewal(make_subscription):
+    # Renewed on Nov 30 for December, then downgraded the same day
+    subscription = make_subscription(plan_id=1, end_date=datetime.date(2025, 12, 30))
+    add_billing(subscription, 2, 'initial', datetime.date(2025, 11, 1), datetime.date(2025, 11, 30))
+    add_billing(subscription, 2, 'renewal', datetime.date(2025, 12, 1), datetime.date(2025, 12, 30))
+    add_billing(subscription, 1, 'proration', datetime.date(2025, 11, 30), datetime.date(2025, 12, 30))
+    db.session.commit()
+
+    rows = utilization(datetime.date(2025, 12, 1), datetime.date(2025, 12, 31))
+
+    assert rows[('2025-12', 1)][0] == 1
+    assert rows[('2025-12', 2)][0] == 0
+
+
+def test_utilization_counts_subscriptions_without_billing_on_current_plan(make_subscription):
+    make_subscription(plan_id=3, end_date=datetime.date(2025, 11, 20))
+    cancelled = make_subscription(plan_id=3, end_date=datetime.date(2025, 12, 20))
+    cancelled.cancelled_at = datetime.datetime(2025, 10, 31, 9)
+    db.session.commit()
+
+    rows = utilization(datetime.date(2025, 11, 1), datetime.date(2025, 11, 30))
+
+    assert rows[('2025-11', 3)] == (1, 8, 0)
+    assert not any(plan_id == 4 for _, plan_id in rows)  # unlimited plan is skipped
+
+
+def test_utilization_counts_both_plans_on_the_changeover_day(make_subscription):
+    subscription = make_subscription(plan_id=2, end_date=datetime.date(2025, 12, 4))
+    add_billing(subscription, 1, 'initial', DAY, datetime.date(2025, 12, 4))
+    add_billing(subscription, 2, 'proration', DAY, datetime.date(2025, 12, 4))
+    record_visit_rollup(1, at(DAY), 0)
+    db.session.commit()
+
+    rows = utilization(datetime.date(2025, 11, 1), datetime.date(2025, 12, 31))
+
+    assert rows[('2025-11', 1)] == (1, 2, 1)
+    assert rows[('2025-11', 2)] == (1, 4, 0)
+    assert rows[('2025-12', 1)] == (0, 0, 0)
+    assert rows[('2025-12', 2)] == (1, 4, 0)
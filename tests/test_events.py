@@ -0,0 +1,79 @@
+"""Tests for billing event replay."""
+
+import datetime
+import json
+
+from src.models import BillingEvent
+from src.services import replay_events
+from src.services.events import (
+    AUTO_RENEW_CHANGED, PLAN_CHANGED, SUBSCRIPTION_CANCELLED, SUBSCRIPTION_CREATED,
+    SUBSCRIPTION_RENEWED, VISIT_RECORDED
+)
+
+
+def make_events(*specs):
+    """Build unsaved events from (event_type, subscription_id, day, payload) tuples."""
+    return [
+        BillingEvent(
+            id=i,
+            event_type=event_type,
+            user_id=1,
+            subscription_id=subscription_id,
+            occurred_at=datetime.datetime(2025, 11, day, 12),
+            payload_json=json.dumps(payload)
+        )
+        for i, (event_type, subscription_id, day, payload) in enumerate(specs, start=1)
+    ]
+
+
+def test_replay_builds_ledger_usage_and_balance():
+    events = make_events(
+        (SUBSCRIPTION_CREATED, 1, 1, {'plan_id': 1, 'amount': 25.0}),
+        (VISIT_RECORDED, 1, 2, {'cost': 0}),
+        (VISIT_RECORDED, 1, 3, {'cost': 15.0}),
+        (PLAN_CHANGED, 1, 10, {'from_plan_id': 1, 'to_plan_id': 2, 'amount': 13.33}),
+        (AUTO_RENEW_CHANGED, 1, 11, {'auto_renew': False}),
+        (SUBSCRIPTION_RENEWED, 1, 30, {'plan_id': 2, 'amount': 45.0}),
+    )
+
+    sub = replay_events(events)[1]
+
+    assert sub['plan_id'] == 2
+    assert sub['status'] == 'active'
+    assert sub['usage'] == {'2025-11': {
+        'visits': 2, 'included_visits': 1, 'extra_visits': 1, 'extra_charges': 15.0
+    }}
+    assert [(e['event_id'], e['amount']) for e in sub['ledger']] == [(1, 25.0), (3, 15.0), (4, 13.33), (6, 45.0)]
+    assert sub['balance'] == 98.33
+
+
+def test_replay_keeps_credits_and_cancellation():
+    events = make_events(
+        (SUBSCRIPTION_CREATED, 1, 1, {'plan_id': 2, 'amount': 45.0}),
+        (PLAN_CHANGED, 1, 16, {'from_plan_id': 2, 'to_plan_id': 1, 'amount': -10.0}),
+        (SUBSCRIPTION_CANCELLED, 1, 20, {}),
+    )
+
+    sub = replay_events(events)[1]
+
+    assert sub['status'] == 'cancelled'
+    assert sub['plan_id'] == 1
+    assert sub['balance'] == 35.0
+
+
+def test_replay_separates_subscriptions():
+    events = make_events(
+        (SUBSCRIPTION_CREATED, 1, 1, {'plan_id': 1, 'amount': 25.0}),
+        (SUBSCRIPTION_CREATED, 2, 1, {'plan_id': 3, 'amount': 80.0}),
+        (VISIT_RECORDED, 2, 2, {'cost': 0}),
+    )
+
+    state = replay_events(events)
+
+    assert {sid: sub['balance'] for sid, sub in state.items()} == {1: 25.0, 2: 80.0}
+    assert state[1]['usage'] == {}
+    assert state[2]['usage']['2025-11']['visits'] == 1
+
+
+def test_replay_of_no_events_is_empty():
+    assert replay_events([]) == {}
@@ -0,0 +1,130 @@
+"""Tests for JWT encoding, verification and key rotation."""
+
+import json
+
+import jwt
+import pytest
+
+from scripts.generate_jwt_key import generate
+from src.config.jwt_keys import KeyRing
+from src.config.settings import Settings, settings
+from src.controllers.auth import routes as auth_routes
+from src.controllers.auth.routes import decode_jwt, encode_jwt
+
+
+@pytest.fixture
+def hs256_ring(monkeypatch):
+    ring = KeyRing('HS256', secret='test-secret')
+    monkeypatch.setattr(auth_routes, 'key_ring', ring)
+    return ring
+
+
+@pytest.fixture
+def eddsa_keys(tmp_path, monkeypatch):
+    """Publish kid 'k1' and sign with it; returns a function that publishes more kids."""
+    jwks = tmp_path / 'jwks.json'
+
+    def publish(kid):
+        private_out = tmp_path / f'{kid}.pem'
+        generate(kid, 'EdDSA', str(private_out), str(jwks))
+        return str(private_out)
+
+    ring = KeyRing('EdDSA', private_key_file=publish('k1'), signing_kid='k1', jwks_file=str(jwks))
+    monkeypatch.setattr(auth_routes, 'key_ring', ring)
+    return publish
+
+
+def test_access_token_round_trip(hs256_ring):
+    payload = decode_jwt(encode_jwt(7, tenant_id='clinic-a'))
+
+    assert payload['user_id'] == 7
+    assert payload['tenant'] == 'clinic-a'
+    assert payload['type'] == 'access'
+
+
+def test_token_type_must_match(hs256_ring):
+    refresh = encode_jwt(7, token_type='refresh')
+
+    assert decode_jwt(refresh) is None
+    assert decode_jwt(refresh, token_type='refresh')['user_id'] == 7
+    assert decode_jwt(encode_jwt(7), token_type='refresh') is None
+
+
+def test_untyped_legacy_token_is_an_access_token(hs256_ring):
+    token = jwt.encode({'user_id': 7}, 'test-secret', algorithm='HS256')
+
+    assert decode_jwt(token)['user_id'] == 7
+    assert decode_jwt(token, token_type='refresh') is None
+
+
+def test_bad_signature_and_garbage_are_rejected(hs256_ring):
+    forged = jwt.encode({'user_id': 7, 'type': 'access'}, 'other-secret', algorithm='HS256')
+
+    assert decode_jwt(forged) is None
+    assert decode_jwt('not-a-token') is None
+
+
+def test_expired_token_is_rejected(hs256_ring, monkeypatch):
+    monkeypatch.setattr(settings, 'JWT_ACCESS_TTL_SECONDS', -1)
+
+    assert decode_jwt(encode_jwt(7)) is None
+
+
+def test_eddsa_token_carries_kid(eddsa_keys):
+    token = encode_jwt(7)
+
+    assert jwt.get_unverified_header(token)['kid'] == 'k1'
+    assert decode_jwt(token)['user_id'] == 7
+
+
+def test_unknown_kid_is_rejected(eddsa_keys):
+    key, _ = auth_routes.key_ring.signing_key()
+    token = jwt.encode({'user_id': 7, 'type': 'access'}, key, algorithm='EdDSA', headers={'kid': 'nope'})
+
+    assert decode_jwt(token) is None
+
+
+def test_newly_published_kid_is_picked_up_despite_unknown_kid_lookups(eddsa_keys):
+    ring = auth_routes.key_ring
+    assert ring.verification_key('k2') is None
+
+    private_key_file = eddsa_keys('k2')
+    issuer = KeyRing('EdDSA', private_key_file=private_key_file, signing_kid='k2')
+    key, kid = issuer.signing_key()
+    token = jwt.encode({'user_id': 7, 'type': 'access'}, key, algorithm='EdDSA', headers={'kid': kid})
+
+    assert decode_jwt(token)['user_id'] == 7
+
+
+def test_malformed_jwk_is_skipped_and_other_keys_still_verify(eddsa_keys, tmp_path):
+    token = encode_jwt(7)
+    jwks = tmp_path / 'jwks.json'
+    data = json.loads(jwks.read_text())
+    data['keys'].append({**data['keys'][0], 'kid': 'broken', 'x': 'AAAA'})
+    jwks.write_text(json.dumps(data))
+
+    bogus = jwt.encode({'user_id': 7, 'type': 'access'}, 'x', algorithm='HS256', headers={'kid': 'broken'})
+
+    assert decode_jwt(bogus) is None
+    assert decode_jwt(token)['user_id'] == 7
+    assert [k['kid'] for k in auth_routes.key_ring.public_jwks()['keys']] == ['k1']
+
+
+def test_unparseable_jwks_file_keeps_previous_keys(eddsa_keys, tmp_path):
+    token = encode_jwt(7)
+    assert decode_jwt(token)['user_id'] == 7
+
+    (tmp_path / 'jwks.json').write_text('{"keys": [')
+    key, _ = auth_routes.key_ring.signing_key()
+    unknown = jwt.encode({'user_id': 7, 'type': 'access'}, key, algorithm='EdDSA', headers={'kid': 'k9'})
+
+    assert decode_jwt(unknown) is None
+    assert decode_jwt(token)['user_id'] == 7
+
+
+@pytest.mark.parametrize('algorithm', ['RS256', 'none', 'hs256'])
+def test_unsupported_algorithm_is_rejected_at_startup(monkeypatch, algorithm):
+    monkeypatch.setenv('JWT_ALGORITHM', algorithm)
+
+    with pytest.raises(ValueError, match='JWT_ALGORITHM'):
+        Settings()
@@ -0,0 +1,106 @@
+"""Tests for in-flight tracking, draining and the health probes."""
+
+import threading
+import time
+
+import pytest
+from sqlalchemy import text
+
+from src.config.database import db
+from src.services import lifecycle, warm_caches
+from src.services.lifecycle import Lifecycle
+
+
+def test_wait_idle_returns_immediately_when_idle():
+    assert Lifecycle().wait_idle(0) is True
+
+
+def test_wait_idle_times_out_with_work_in_flight():
+    tracker = Lifecycle()
+    tracker.begin()
+
+    started = time.monotonic()
+    assert tracker.wait_idle(0.05) is False
+    assert time.monotonic() - started >= 0.05
+    assert tracker.in_flight == 1
+
+
+def test_wait_idle_wakes_when_tracked_work_finishes():
+    tracker = Lifecycle()
+    release = threading.Event()
+
+    def job():
+        with tracker.track():
+            release.wait()
+
+    thread = threading.Thread(target=job)
+    thread.start()
+    while tracker.in_flight == 0:
+        time.sleep(0.001)
+
+    threading.Timer(0.05, release.set).start()
+    assert tracker.wait_idle(5) is True
+    assert tracker.in_flight == 0
+    thread.join()
+
+
+def test_healthz_is_always_ok(client):
+    assert client.get('/healthz').json == {'status': 'ok'}
+
+
+def test_readyz_waits_for_warm_caches(client):
+    response = client.get('/readyz')
+    assert response.status_code == 503
+    assert response.json['checks']['database']['plan_catalog_warm'] is False
+
+    warm_caches()
+
+    response = client.get('/readyz')
+    assert response.status_code == 200
+    assert response.json['status'] == 'ready'
+    assert response.json['checks']['database']['pending_migrations'] == []
+
+
+def test_readyz_reports_pending_migrations(client):
+    warm_caches()
+    with db.engine.begin() as conn:
+        conn.execute(text('ALTER TABLE subscription DROP COLUMN cancelled_at'))
+
+    response = client.get('/readyz')
+
+    assert response.status_code == 503
+    assert response.json['checks']['database']['pending_migrations'] == ['subscription.cancelled_at']
+
+
+def test_readyz_fails_once_shutting_down(client, monkeypatch):
+    warm_caches()
+    monkeypatch.setattr(lifecycle, 'shutting_down', True)
+
+    response = client.get('/readyz')
+
+    assert response.status_code == 503
+    assert response.json['checks']['lifecycle']['shutting_down'] is True
+
+
+def test_requests_still_served_while_shutting_down_but_rejected_while_draining(client, monkeypatch):
+    monkeypatch.setattr(lifecycle, 'shutting_down', True)
+    assert client.get('/api/auth/jwks').status_code == 200
+
+    monkeypatch.setattr(lifecycle, 'draining', True)
+    response = client.get('/api/auth/jwks')
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+    assert client.get('/healthz').status_code == 200
+
+
+@pytest.mark.parametrize('path', ['/api/auth/jwks', '/healthz'])
+def test_requests_are_counted_in_flight_only_outside_probes(client, path):
+    seen = []
+    client.application.before_request_funcs.setdefault(None, []).append(
+        lambda: seen.append(lifecycle.in_flight)
+    )
+
+    client.get(path)
+
+    assert seen == [1 if path == '/api/auth/jwks' else 0]
+    assert lifecycle.in_flight == 0
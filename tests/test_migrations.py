@@ -0,0 +1,47 @@
+"""Tests for the column migrations applied at startup."""
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects import postgresql
+
+from src.config.migrations import COLUMN_MIGRATIONS, add_column_ddl, apply_migrations, pending_migrations
+
+
+@pytest.fixture
+def legacy_engine(tmp_path):
+    """A database with the tables as they were before the migrated columns existed."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.execute(text('CREATE TABLE plan (id INTEGER PRIMARY KEY)'))
+        conn.execute(text(
+            'CREATE TABLE subscription (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, '
+            'plan_id INTEGER NOT NULL, start_date DATE NOT NULL, end_date DATE NOT NULL)'
+        ))
+        conn.execute(text(
+            'CREATE TABLE visit (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, '
+            'subscription_id INTEGER NOT NULL, visit_date DATETIME NOT NULL, cost FLOAT NOT NULL, notes TEXT)'
+        ))
+        conn.execute(text("INSERT INTO subscription VALUES (1, 1, 1, '2024-09-01', '2024-10-01')"))
+    yield engine
+    engine.dispose()
+
+
+def test_migrations_add_columns_with_defaults_for_existing_rows(legacy_engine):
+    assert len(pending_migrations(legacy_engine)) == len(COLUMN_MIGRATIONS)
+
+    apply_migrations(legacy_engine)
+    apply_migrations(legacy_engine)  # safe to run again
+
+    assert pending_migrations(legacy_engine) == []
+    with legacy_engine.connect() as conn:
+        row = conn.execute(text('SELECT period_days, auto_renew, cancelled_at FROM subscription')).one()
+    assert tuple(row) == (30, 0, None)
+
+
+def test_postgresql_ddl_uses_its_own_types_and_literals():
+    dialect = postgresql.dialect()
+    ddl = {column.name: add_column_ddl(table, column, dialect) for table, column in COLUMN_MIGRATIONS}
+
+    assert ddl['auto_renew'] == 'ALTER TABLE subscription ADD COLUMN auto_renew BOOLEAN DEFAULT false NOT NULL'
+    assert ddl['cancelled_at'] == 'ALTER TABLE subscription ADD COLUMN cancelled_at TIMESTAMP WITHOUT TIME ZONE'
+    assert ddl['plan_id'] == 'ALTER TABLE visit ADD COLUMN plan_id INTEGER REFERENCES plan (id)'
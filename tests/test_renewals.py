@@ -0,0 +1,110 @@
+"""Tests for plan-change proration and batch renewals."""
+
+import datetime
+
+from src.config.database import db
+from src.models import BillingRecord, Plan, Subscription
+from src.services import process_due_renewals, prorate_plan_change
+from src.services.renewals import _apply_renewals, _renew_batch
+
+TODAY = datetime.date(2025, 11, 10)
+
+
+def test_prorate_upgrade_charges_price_difference_for_remaining_days(make_subscription):
+    subscription = make_subscription(plan_id=1, end_date=TODAY + datetime.timedelta(days=14))
+    record = prorate_plan_change(subscription, db.session.get(Plan, 2), today=TODAY)
+    db.session.commit()
+
+    # (45 - 25) * 15 days left including today / 30
+    assert record.amount == 10.0
+    assert record.kind == 'proration'
+    assert record.period_start == TODAY
+    assert record.period_end == subscription.end_date
+    assert subscription.plan_id == 2
+
+
+def test_prorate_downgrade_is_a_credit(make_subscription):
+    subscription = make_subscription(plan_id=2, end_date=TODAY + datetime.timedelta(days=14))
+    record = prorate_plan_change(subscription, db.session.get(Plan, 1), today=TODAY)
+
+    assert record.amount == -10.0
+
+
+def test_prorate_caps_remaining_days_at_period_length(make_subscription):
+    subscription = make_subscription(plan_id=1, end_date=TODAY + datetime.timedelta(days=60), period_days=7)
+    record = prorate_plan_change(subscription, db.session.get(Plan, 2), today=TODAY)
+
+    assert record.amount == round(20 * 7 / 30, 2)
+
+
+def test_renew_batch_extends_by_one_period_and_bills_period_price():
+    end = TODAY - datetime.timedelta(days=1)
+    rows = [(1, 10, 2, end, 30, 45.0), (2, 11, 1, end, 15, 25.0)]
+
+    sub_updates, billing_rows, lapsed_ids = _renew_batch(rows, TODAY, datetime.datetime(2025, 11, 10))
+
+    assert sub_updates == [
+        {'sub_id': 1, 'old_end_date': end, 'new_end_date': end + datetime.timedelta(days=30)},
+        {'sub_id': 2, 'old_end_date': end, 'new_end_date': end + datetime.timedelta(days=15)},
+    ]
+    assert [row['amount'] for row in billing_rows] == [45.0, 12.5]
+    assert billing_rows[0]['period_start'] == TODAY
+    assert billing_rows[0]['period_end'] == end + datetime.timedelta(days=30)
+    assert lapsed_ids == []
+
+
+def test_renew_batch_does_not_bill_subscriptions_lapsed_a_full_period():
+    rows = [(1, 10, 2, TODAY - datetime.timedelta(days=30), 30, 45.0)]
+
+    sub_updates, billing_rows, lapsed_ids = _renew_batch(rows, TODAY, datetime.datetime(2025, 11, 10))
+
+    assert sub_updates == []
+    assert billing_rows == []
+    assert lapsed_ids == [1]
+
+
+def test_apply_renewals_skips_rows_already_renewed_by_another_run(make_subscription):
+    end = datetime.date.today() - datetime.timedelta(days=1)
+    first = make_subscription(end_date=end)
+    second = make_subscription(end_date=end)
+    new_end = end + datetime.timedelta(days=30)
+
+    # A concurrent run already moved the second subscription on
+    second.end_date = new_end
+    db.session.commit()
+
+    applied = _apply_renewals(
+        [
+            {'sub_id': first.id, 'old_end_date': end, 'new_end_date': new_end},
+            {'sub_id': second.id, 'old_end_date': end, 'new_end_date': new_end},
+        ],
+        ['first', 'second']
+    )
+
+    assert applied == ['first']
+
+
+def test_process_due_renewals_renews_once(make_subscription):
+    end = datetime.date.today() - datetime.timedelta(days=1)
+    due = make_subscription(plan_id=2, end_date=end)
+    make_subscription(end_date=end, auto_renew=False)
+
+    assert process_due_renewals(batch_size=1) == 1
+    assert process_due_renewals() == 0
+
+    assert db.session.get(Subscription, due.id).end_date == end + datetime.timedelta(days=30)
+    assert [(r.subscription_id, r.amount) for r in BillingRecord.query.all()] == [(due.id, 45.0)]
+
+
+def test_subscription_is_renewed_on_its_last_day_without_an_active_gap(make_subscription):
+    today = datetime.date.today()
+    tomorrow = today + datetime.timedelta(days=1)
+    subscription = make_subscription(end_date=today)
+
+    assert process_due_renewals(as_of=today) == 1
+
+    renewed = db.session.get(Subscription, subscription.id)
+    assert renewed.end_date == today + datetime.timedelta(days=30)
+    assert renewed.is_active(tomorrow)
+    assert Subscription.query.filter(Subscription.active_filter(tomorrow)).count() == 1
+    assert BillingRecord.query.one().period_start == tomorrow
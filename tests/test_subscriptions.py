@@ -0,0 +1,59 @@
+"""Tests for subscription request validation."""
+
+import pytest
+
+
+@pytest.fixture
+def logged_in(client):
+    credentials = {'username': 'alice', 'password': 'p'}
+    client.post('/api/auth/signup', json=credentials)
+    client.post('/api/auth/login', json=credentials)
+    return client
+
+
+@pytest.mark.parametrize('body', [
+    {'plan_id': '1'},
+    {'plan_id': True},
+    {'plan_id': 1, 'duration_days': True},
+    {'plan_id': 1, 'duration_days': 0},
+    {'plan_id': 1, 'duration_days': '30'},
+    {'plan_id': 1, 'auto_renew': 'false'},
+    {'plan_id': 1, 'auto_renew': 0},
+])
+def test_create_subscription_rejects_non_json_typed_values(logged_in, body):
+    assert logged_in.post('/api/subscriptions', json=body).status_code == 400
+
+
+def test_create_subscription_accepts_json_boolean(logged_in):
+    response = logged_in.post('/api/subscriptions', json={'plan_id': 1, 'auto_renew': False})
+
+    assert response.status_code == 201
+    assert response.json['auto_renew'] is False
+
+
+@pytest.mark.parametrize('value', ['false', 'true', 0, None])
+def test_set_auto_renew_requires_json_boolean(logged_in, value):
+    sub_id = logged_in.post('/api/subscriptions', json={'plan_id': 1}).json['subscription_id']
+
+    response = logged_in.put(f'/api/subscriptions/{sub_id}/auto-renew', json={'auto_renew': value})
+
+    assert response.status_code == 400
+
+
+def test_set_auto_renew_toggles_active_subscription(logged_in):
+    sub_id = logged_in.post('/api/subscriptions', json={'plan_id': 1}).json['subscription_id']
+
+    response = logged_in.put(f'/api/subscriptions/{sub_id}/auto-renew', json={'auto_renew': False})
+
+    assert response.status_code == 200
+    assert response.json['auto_renew'] is False
+
+
+def test_set_auto_renew_rejects_cancelled_subscription(logged_in):
+    sub_id = logged_in.post('/api/subscriptions', json={'plan_id': 1}).json['subscription_id']
+    assert logged_in.delete(f'/api/subscriptions/{sub_id}').status_code == 200
+
+    response = logged_in.put(f'/api/subscriptions/{sub_id}/auto-renew', json={'auto_renew': True})
+
+    assert response.status_code == 400
+    assert logged_in.get('/api/subscriptions').json[0]['auto_renew'] is False
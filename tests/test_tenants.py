@@ -0,0 +1,77 @@
+"""Tests for per-tenant database routing and tenant-scoped admin access."""
+
+import pytest
+
+from src.config.database import db
+from src.config.settings import settings
+from src.config.tenants import UnknownTenantError, tenant_context
+from src.models import Plan, Subscription, User
+
+
+def test_session_routes_to_the_current_tenant(tenants):
+    with tenant_context('clinic-a'):
+        db.session.add(User(username='alice', password=b'x'))
+        db.session.commit()
+
+    with tenant_context('clinic-a'):
+        assert User.query.count() == 1
+    with tenant_context('clinic-b'):
+        assert User.query.count() == 0
+        assert Plan.query.count() == 4  # bootstrapped with the default plans
+    with tenant_context(None):
+        assert User.query.count() == 0
+
+
+def test_unknown_or_malformed_tenant_is_rejected(tenants):
+    with pytest.raises(UnknownTenantError):
+        tenants.get_engine('clinic-z')
+
+    tenants._tenant_ids.append('../evil')
+    with pytest.raises(UnknownTenantError):
+        tenants.get_engine('../evil')
+
+
+def test_signup_requires_a_known_tenant(client, tenants):
+    assert client.post('/api/auth/signup', json={'username': 'a', 'password': 'p'}).status_code == 400
+    assert client.post('/api/auth/signup', json={'username': 'a', 'password': 'p'},
+                       headers={'X-Tenant-ID': 'clinic-z'}).status_code == 404
+
+
+def test_logged_in_requests_use_the_tenant_from_the_token(client, tenants):
+    credentials = {'username': 'alice', 'password': 'p', 'tenant': 'clinic-b'}
+    assert client.post('/api/auth/signup', json=credentials).status_code == 201
+    assert client.post('/api/auth/login', json=credentials).status_code == 200
+
+    response = client.post('/api/subscriptions', json={'plan_id': 1})
+    assert response.status_code == 201
+
+    with tenant_context('clinic-b'):
+        assert Subscription.query.count() == 1
+    with tenant_context('clinic-a'):
+        assert Subscription.query.count() == 0
+
+
+@pytest.mark.parametrize('path', [
+    '/api/admin/analytics/visits',
+    '/api/admin/events',
+])
+def test_tenant_scoped_admin_endpoints_require_tenant_header(client, tenants, admin_headers, path):
+    assert client.get(path, headers=admin_headers).status_code == 400
+    assert client.get(path, headers={**admin_headers, 'X-Tenant-ID': 'clinic-a'}).status_code == 200
+    assert client.get(path, headers={**admin_headers, 'X-Tenant-ID': 'clinic-z'}).status_code == 404
+
+
+def test_tenant_metrics_span_all_tenants_without_header(client, tenants, admin_headers):
+    assert client.get('/api/admin/metrics/tenants', headers=admin_headers).status_code == 200
+
+
+def test_admin_endpoints_need_no_tenant_header_without_tenancy(client, admin_headers):
+    assert client.get('/api/admin/analytics/visits', headers=admin_headers).status_code == 200
+
+
+def test_admin_key_is_checked_before_tenant(client, tenants, admin_headers, monkeypatch):
+    assert client.get('/api/admin/events').status_code == 401
+    assert client.get('/api/admin/events', headers={'X-Admin-Key': 'wrong'}).status_code == 401
+
+    monkeypatch.setattr(settings, 'ADMIN_API_KEY', None)
+    assert client.get('/api/admin/events', headers=admin_headers).status_code == 403